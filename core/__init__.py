@@ -11,12 +11,15 @@ from .window_utils import (
     get_windows_by_process,
     get_available_processes,
     is_window_minimized,
+    invalidate_window_cache,
+    invalidate_screen_cache,
 )
 
 from .image_matcher import (
     find_and_click,
     check_template_visible,
     MATCH_THRESHOLD,
+    TEMPLATE_NOT_FOUND,
 )
 
 from .task_manager import Task, TaskManager
@@ -34,10 +37,13 @@ __all__ = [
     'get_windows_by_process',
     'get_available_processes',
     'is_window_minimized',
+    'invalidate_window_cache',
+    'invalidate_screen_cache',
     # Image matcher
     'find_and_click',
     'check_template_visible',
     'MATCH_THRESHOLD',
+    'TEMPLATE_NOT_FOUND',
     # Task manager
     'Task',
     'TaskManager',
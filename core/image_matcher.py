@@ -2,11 +2,17 @@
 Funcoes para template matching e clique em imagens.
 Usa OpenCV para deteccao e Quartz/CGEvent para cliques no macOS.
 Usa mss para captura de tela (mais eficiente em memoria).
+
+O matchTemplate do OpenCV ja e paralelizado internamente (pool de threads
+do proprio OpenCV); as otimizacoes SIMD sao habilitadas explicitamente ao
+importar o modulo. Quem roda varios matchings em paralelo (ex.: tasks do
+CLI) deve limitar cv2.setNumThreads para nao sobrescrever a CPU.
 """
 
+import threading
 import time
 from pathlib import Path
-from typing import Callable, Optional, Tuple
+from typing import Callable, NamedTuple, Optional, Tuple
 
 import cv2
 import mss
@@ -27,11 +33,64 @@ from Quartz import (
 )
 from Quartz.CoreGraphics import CGPointMake
 
-from .window_utils import get_window_dpi_scale, get_window_rect, is_window_visible
+from .window_utils import (
+    get_main_display_scale,
+    get_window_dpi_scale,
+    get_window_rect,
+    is_window_visible,
+)
 
 # Threshold minimo para considerar um match valido (85%)
 MATCH_THRESHOLD = 0.85
 
+# Mensagem de find_and_click quando o template nao existe ou nao pode ser lido
+TEMPLATE_NOT_FOUND = 'Template nao encontrado'
+
+# Cache de templates decodificados e ja escalados para o DPI da janela
+# Chave: (caminho, mtime_ns, dpi_janela) - recapturar o template invalida a entrada
+_template_cache: dict = {}
+_template_cache_lock = threading.Lock()
+_TEMPLATE_CACHE_MAX = 64
+
+# Busca em piramide: passada grossa em 1/4 da resolucao para localizar o pico,
+# depois refina em resolucao cheia so numa ROI ao redor dele
+_PYRAMID_FACTOR = 4
+_PYRAMID_PAD = 8  # pixels de folga da ROI em resolucao cheia
+_PYRAMID_MIN_TEMPLATE = 32  # menor lado do template para usar a piramide
+
+# Garante os caminhos otimizados (SIMD/IPP) do OpenCV
+cv2.setUseOptimized(True)
+
+
+# Buffers reutilizados entre ticks da mesma thread (captura em cinza, imagem
+# reduzida e mapa de correlacao): evita alocar e zerar varios MB por tick
+_thread_buffers = threading.local()
+
+
+def _get_buffer(name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+    """Retorna o buffer da thread atual com o shape pedido (realoca so se mudar)."""
+    buffer = getattr(_thread_buffers, name, None)
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        buffer = np.empty(shape, dtype)
+        setattr(_thread_buffers, name, buffer)
+    return buffer
+
+
+def _match_result_buffer(name: str, image: np.ndarray, template: np.ndarray) -> np.ndarray:
+    """Buffer float32 com o shape do resultado de matchTemplate(image, template)."""
+    return _get_buffer(
+        name,
+        (image.shape[0] - template.shape[0] + 1, image.shape[1] - template.shape[1] + 1),
+        np.float32
+    )
+
+
+class PreparedTemplate(NamedTuple):
+    """Template carregado e pronto para o matching (ver prepare_template)."""
+    template: np.ndarray
+    dpi: float
+    small: Optional[np.ndarray]  # versao reduzida para a passada grossa
+
 
 def get_template_dpi(template_path: Path) -> float:
     """Le o DPI de captura dos metadados do template PNG.
@@ -68,12 +127,142 @@ def get_template_dpi(template_path: Path) -> float:
     return 1.0
 
 
-def _is_window_valid_for_capture(window_id: int) -> bool:
+def prepare_template(template_gray: np.ndarray, dpi: float = 1.0) -> PreparedTemplate:
+    """
+    Prepara um template em cinza para matchings repetidos.
+
+    Calcula uma unica vez tudo o que nao depende da captura (a versao
+    reduzida usada na passada grossa da piramide).
+
+    Args:
+        template_gray: Template em escala de cinza
+        dpi: Escala DPI em que o template foi capturado
+
+    Returns:
+        PreparedTemplate com arrays somente-leitura
+    """
+    template_gray.flags.writeable = False
+
+    small = None
+    if min(template_gray.shape) >= _PYRAMID_MIN_TEMPLATE:
+        small = cv2.resize(
+            template_gray, None,
+            fx=1 / _PYRAMID_FACTOR, fy=1 / _PYRAMID_FACTOR,
+            interpolation=cv2.INTER_AREA
+        )
+        small.flags.writeable = False
+
+    return PreparedTemplate(template_gray, dpi, small)
+
+
+def _load_template(template_path: Path, window_dpi: float) -> Optional[PreparedTemplate]:
+    """
+    Carrega o template em escala de cinza ja escalado para o DPI da janela.
+
+    Tasks repetidas reutilizam o resultado em vez de decodificar o PNG,
+    ler os metadados de DPI e redimensionar a cada execucao.
+
+    Args:
+        template_path: Caminho para o arquivo PNG do template
+        window_dpi: Escala DPI da janela alvo
+
+    Returns:
+        PreparedTemplate ou None se o template nao existir ou nao puder ser lido.
+        Os arrays sao compartilhados entre chamadas e nao devem ser modificados.
+    """
+    try:
+        mtime = template_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = (str(template_path), mtime, round(window_dpi, 2))
+    with _template_cache_lock:
+        cached = _template_cache.get(key)
+    if cached is not None:
+        return cached
+
+    template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
+    if template is None:
+        return None
+
+    # Calcula escala necessaria baseado no DPI do template vs DPI da janela
+    template_dpi = get_template_dpi(template_path)
+    dpi_scale = window_dpi / template_dpi
+    if abs(dpi_scale - 1.0) > 0.05:  # Diferenca significativa (>5%)
+        new_w = int(template.shape[1] * dpi_scale)
+        new_h = int(template.shape[0] * dpi_scale)
+        template = cv2.resize(template, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+    entry = prepare_template(template, template_dpi)
+    with _template_cache_lock:
+        if len(_template_cache) >= _TEMPLATE_CACHE_MAX:
+            _template_cache.clear()
+        _template_cache[key] = entry
+    return entry
+
+
+def match_template(screenshot_gray: np.ndarray, entry: PreparedTemplate) -> Tuple[float, Tuple[int, int]]:
+    """
+    Executa o template matching (TM_CCOEFF_NORMED) e retorna o melhor pico.
+
+    Com template grande o bastante, localiza o pico numa passada em
+    1/_PYRAMID_FACTOR da resolucao e refina em resolucao cheia apenas
+    na ROI ao redor dele. Caso contrario, faz a busca direta.
+
+    Args:
+        screenshot_gray: Captura da janela em escala de cinza
+        entry: Template preparado (ver prepare_template)
+
+    Returns:
+        Tupla (max_val, max_loc) em coordenadas da captura
+    """
+    template = entry.template
+    th, tw = template.shape
+
+    height, width = screenshot_gray.shape
+
+    if entry.small is not None:
+        small_w = max(round(width / _PYRAMID_FACTOR), 1)
+        small_h = max(round(height / _PYRAMID_FACTOR), 1)
+        small_src = cv2.resize(
+            screenshot_gray, (small_w, small_h),
+            dst=_get_buffer('small', (small_h, small_w)),
+            interpolation=cv2.INTER_AREA
+        )
+        sh, sw = entry.small.shape
+        if sh <= small_h and sw <= small_w:
+            result = cv2.matchTemplate(
+                small_src, entry.small, cv2.TM_CCOEFF_NORMED,
+                result=_match_result_buffer('small_result', small_src, entry.small)
+            )
+            _, _, _, (cx, cy) = cv2.minMaxLoc(result)
+
+            # Refina em resolucao cheia ao redor do pico grosso
+            x0 = max(cx * _PYRAMID_FACTOR - _PYRAMID_PAD, 0)
+            y0 = max(cy * _PYRAMID_FACTOR - _PYRAMID_PAD, 0)
+            x1 = min(cx * _PYRAMID_FACTOR + tw + _PYRAMID_PAD, width)
+            y1 = min(cy * _PYRAMID_FACTOR + th + _PYRAMID_PAD, height)
+            roi = screenshot_gray[y0:y1, x0:x1]
+            if roi.shape[0] >= th and roi.shape[1] >= tw:
+                result = cv2.matchTemplate(roi, template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, (rx, ry) = cv2.minMaxLoc(result)
+                return max_val, (x0 + rx, y0 + ry)
+
+    result = cv2.matchTemplate(
+        screenshot_gray, template, cv2.TM_CCOEFF_NORMED,
+        result=_match_result_buffer('result', screenshot_gray, template)
+    )
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+
+def _is_window_valid_for_capture(window_id: int, rect: Optional[Tuple[int, int, int, int]] = None) -> bool:
     """
     Verifica se a janela esta em um estado valido para captura.
 
     Args:
         window_id: ID da janela
+        rect: Rect da janela ja obtido pelo chamador (evita nova consulta)
 
     Returns:
         True se a janela pode ser capturada
@@ -84,7 +273,8 @@ def _is_window_valid_for_capture(window_id: int) -> bool:
             return False
 
         # Verifica dimensoes validas
-        rect = get_window_rect(window_id)
+        if rect is None:
+            rect = get_window_rect(window_id)
         if not rect:
             return False
 
@@ -97,31 +287,25 @@ def _is_window_valid_for_capture(window_id: int) -> bool:
         return False
 
 
-# Instancia global do mss para evitar criar/destruir a cada captura
-_mss_instance = None
+# Uma instancia do mss por thread (reaproveitada entre capturas): cada
+# instancia serializa suas capturas, entao uma global enfileiraria as threads
+_mss_local = threading.local()
 
 
 def _get_mss():
-    """Retorna instancia global do mss (cria se nao existir)."""
-    global _mss_instance
-    if _mss_instance is None:
-        _mss_instance = mss.mss()
-    return _mss_instance
-
-
-def _get_main_display_scale() -> float:
-    """Retorna o fator de escala do display principal (2.0 para Retina)."""
-    try:
-        from AppKit import NSScreen
-        main_screen = NSScreen.mainScreen()
-        if main_screen:
-            return main_screen.backingScaleFactor()
-    except Exception:
-        pass
-    return 1.0
+    """Retorna a instancia do mss da thread atual (cria se nao existir)."""
+    sct = getattr(_mss_local, 'sct', None)
+    if sct is None:
+        sct = mss.mss()
+        _mss_local.sct = sct
+    return sct
 
 
-def capture_window(window_id: int, restore_if_minimized: bool = False) -> Optional[np.ndarray]:
+def capture_window(
+    window_id: int,
+    restore_if_minimized: bool = False,
+    rect: Optional[Tuple[int, int, int, int]] = None
+) -> Optional[np.ndarray]:
     """
     Captura o conteudo de uma janela usando mss (captura de tela).
     Captura a regiao da tela onde a janela esta posicionada.
@@ -133,17 +317,55 @@ def capture_window(window_id: int, restore_if_minimized: bool = False) -> Option
     Args:
         window_id: ID da janela (kCGWindowNumber)
         restore_if_minimized: IGNORADO - mantido para compatibilidade de API
+        rect: Rect da janela ja obtido pelo chamador. Se None, consulta
 
     Returns:
         numpy array BGR da imagem ou None se janela minimizada/invalida
     """
+    return _capture_window_as(window_id, rect, cv2.COLOR_BGRA2BGR)
+
+
+def capture_window_gray(
+    window_id: int,
+    rect: Optional[Tuple[int, int, int, int]] = None
+) -> Optional[np.ndarray]:
+    """
+    Captura a janela direto em escala de cinza (para template matching).
+
+    Converte o buffer BGRA do mss em uma unica passada, sem gerar
+    a imagem BGR intermediaria de capture_window.
+
+    Args:
+        window_id: ID da janela (kCGWindowNumber)
+        rect: Rect da janela ja obtido pelo chamador. Se None, consulta
+
+    Returns:
+        numpy array em escala de cinza ou None se janela minimizada/invalida.
+        O array e um buffer da thread, sobrescrito na proxima captura dela.
+    """
+    return _capture_window_as(window_id, rect, cv2.COLOR_BGRA2GRAY, buffer_name='gray')
+
+
+def _capture_window_as(
+    window_id: int,
+    rect: Optional[Tuple[int, int, int, int]],
+    color_code: int,
+    buffer_name: Optional[str] = None
+) -> Optional[np.ndarray]:
+    """
+    Captura a janela e converte o BGRA do mss com o codigo cv2 informado.
+
+    Com buffer_name, a conversao escreve no buffer da thread (ver _get_buffer).
+    """
     try:
+        # Obtem coordenadas da janela (em pontos logicos)
+        if rect is None:
+            rect = get_window_rect(window_id)
+
         # Verifica se a janela esta em estado valido para captura
-        if not _is_window_valid_for_capture(window_id):
+        if not _is_window_valid_for_capture(window_id, rect):
             return None
 
-        # Obtem coordenadas da janela (em pontos logicos)
-        rect = get_window_rect(window_id)
         if not rect:
             return None
 
@@ -154,8 +376,8 @@ def capture_window(window_id: int, restore_if_minimized: bool = False) -> Option
         if width <= 0 or height <= 0:
             return None
 
-        # Obtem fator de escala Retina
-        scale = _get_main_display_scale()
+        # Obtem fator de escala Retina (em cache ate a configuracao de telas mudar)
+        scale = get_main_display_scale()
 
         # Captura a regiao da tela usando mss
         # mss no macOS trabalha com coordenadas em pontos logicos
@@ -171,28 +393,48 @@ def capture_window(window_id: int, restore_if_minimized: bool = False) -> Option
         # mss retorna BGRA
         screenshot = sct.grab(monitor)
 
-        # Converte para numpy array BGR
-        img = np.array(screenshot)
-        img_bgr = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        # View sem copia sobre o buffer BGRA; a conversao gera a unica copia
+        raw = np.asarray(screenshot)
+        if buffer_name is not None:
+            img = cv2.cvtColor(raw, color_code, dst=_get_buffer(buffer_name, raw.shape[:2]))
+        else:
+            img = cv2.cvtColor(raw, color_code)
 
         # Se a imagem capturada nao esta na resolucao Retina esperada,
         # redimensiona para manter compatibilidade com templates existentes
         expected_width = int(width * scale)
         expected_height = int(height * scale)
-        actual_height, actual_width = img_bgr.shape[:2]
+        actual_height, actual_width = img.shape[:2]
 
         if actual_width != expected_width or actual_height != expected_height:
             # mss capturou em resolucao diferente, ajusta
-            img_bgr = cv2.resize(img_bgr, (expected_width, expected_height), interpolation=cv2.INTER_LINEAR)
+            img = cv2.resize(img, (expected_width, expected_height), interpolation=cv2.INTER_LINEAR)
 
-        return img_bgr
+        return img
 
     except Exception as e:
         print(f"Erro ao capturar janela: {e}")
         return None
 
 
-def _perform_ghost_click(window_id: int, x: int, y: int, action: str):
+# Serializa os cliques: a busca multi-janela roda em paralelo e eventos de
+# mouse intercalados entre janelas resultariam em cliques incorretos
+_click_lock = threading.Lock()
+
+
+def _perform_ghost_click(
+    window_id: int, x: int, y: int, action: str,
+    rect: Optional[Tuple[int, int, int, int]] = None
+):
+    """Executa clique via CGEvent (serializado entre threads)."""
+    with _click_lock:
+        _post_click_events(window_id, x, y, action, rect)
+
+
+def _post_click_events(
+    window_id: int, x: int, y: int, action: str,
+    rect: Optional[Tuple[int, int, int, int]] = None
+):
     """
     Executa clique via CGEvent.
 
@@ -207,10 +449,12 @@ def _perform_ghost_click(window_id: int, x: int, y: int, action: str):
         x: Coordenada X relativa a janela
         y: Coordenada Y relativa a janela
         action: "click", "double_click" ou "right_click"
+        rect: Rect da janela ja obtido pelo chamador. Se None, consulta
     """
     try:
         # Obtem coordenadas absolutas da janela
-        rect = get_window_rect(window_id)
+        if rect is None:
+            rect = get_window_rect(window_id)
         if not rect:
             return
 
@@ -270,7 +514,8 @@ def find_and_click(
     template_path: Path,
     action: str = "click",
     debug_callback: Optional[Callable[[str], None]] = None,
-    threshold: Optional[float] = None
+    threshold: Optional[float] = None,
+    screenshot_gray: Optional[np.ndarray] = None
 ) -> Tuple[bool, str, float]:
     """
     Encontra template na janela e executa clique.
@@ -281,9 +526,12 @@ def find_and_click(
         action: Tipo de clique - "click", "double_click", "right_click"
         debug_callback: Funcao opcional para debug logging
         threshold: Threshold de deteccao (0.0 a 1.0). Se None, usa MATCH_THRESHOLD
+        screenshot_gray: Captura ja feita da janela em cinza (evita recapturar
+                         quando varias tasks usam a mesma janela). Se None, captura
 
     Returns:
-        Tupla (sucesso, mensagem, percentual_match)
+        Tupla (sucesso, mensagem, percentual_match). Nunca levanta excecao:
+        qualquer falha volta como (False, mensagem, 0.0)
     """
     def debug(msg: str):
         if debug_callback:
@@ -296,41 +544,30 @@ def find_and_click(
             return False, 'Janela nao encontrada', 0.0
         debug(f"  Window rect: {rect}")
 
-        # Captura janela usando CGWindowListCreateImage
-        screenshot_bgr = capture_window(window_id)
+        # Captura janela direto em cinza (reaproveita o rect ja obtido)
+        if screenshot_gray is None:
+            screenshot_gray = capture_window_gray(window_id, rect)
 
-        if screenshot_bgr is None:
+        if screenshot_gray is None:
             return False, 'Falha ao capturar janela', 0.0
 
-        debug(f"  Screenshot shape: {screenshot_bgr.shape}")
-        screenshot_gray = cv2.cvtColor(screenshot_bgr, cv2.COLOR_BGR2GRAY)
+        debug(f"  Screenshot shape: {screenshot_gray.shape}")
 
-        # Carrega template
-        template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            return False, 'Template nao encontrado', 0.0
-        debug(f"  Template shape original: {template.shape}, path: {template_path.name}")
-
-        # Calcula escala necessaria baseado no DPI do template vs DPI da janela
-        template_dpi = get_template_dpi(template_path)
-        window_dpi = get_window_dpi_scale(window_id)
-        dpi_scale = window_dpi / template_dpi  # Escala relativa
-        debug(f"  Template DPI: {template_dpi:.2f} ({int(template_dpi * 100)}%), Window DPI: {window_dpi:.2f} ({int(window_dpi * 100)}%), Scale: {dpi_scale:.2f}")
-
-        if abs(dpi_scale - 1.0) > 0.05:  # Diferenca significativa (>5%)
-            original_h, original_w = template.shape
-            new_w = int(original_w * dpi_scale)
-            new_h = int(original_h * dpi_scale)
-            template = cv2.resize(template, (new_w, new_h), interpolation=cv2.INTER_AREA)
-            debug(f"  Template escalado: {original_w}x{original_h} -> {new_w}x{new_h}")
+        # Carrega template (ja escalado para o DPI da janela, com cache)
+        window_dpi = get_window_dpi_scale(window_id, rect)
+        loaded = _load_template(template_path, window_dpi)
+        if loaded is None:
+            return False, TEMPLATE_NOT_FOUND, 0.0
+        template, template_dpi = loaded.template, loaded.dpi
+        debug(f"  Template shape: {template.shape}, path: {template_path.name}")
+        debug(f"  Template DPI: {template_dpi:.2f} ({int(template_dpi * 100)}%), Window DPI: {window_dpi:.2f} ({int(window_dpi * 100)}%), Scale: {window_dpi / template_dpi:.2f}")
 
         # Verifica se template cabe na screenshot
         if template.shape[0] > screenshot_gray.shape[0] or template.shape[1] > screenshot_gray.shape[1]:
             return False, f'Template maior que janela ({template.shape} > {screenshot_gray.shape})', 0.0
 
         # Template matching
-        result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        max_val, max_loc = match_template(screenshot_gray, loaded)
 
         # Usa threshold passado ou o global
         match_threshold = threshold if threshold is not None else MATCH_THRESHOLD
@@ -344,7 +581,7 @@ def find_and_click(
             # Converte para pontos logicos (CGEvent espera pontos, nao pixels)
             # A imagem capturada esta em pixels fisicos (Retina = 2x)
             # As coordenadas da janela (kCGWindowBounds) estao em pontos logicos
-            window_rect = get_window_rect(window_id)
+            window_rect = rect
             if window_rect:
                 win_width_points = window_rect[2] - window_rect[0]
                 win_height_points = window_rect[3] - window_rect[1]
@@ -362,7 +599,7 @@ def find_and_click(
                 rel_y = pixel_y
 
             # Executa clique
-            _perform_ghost_click(window_id, rel_x, rel_y, action)
+            _perform_ghost_click(window_id, rel_x, rel_y, action, rect)
 
             return True, f'{action} OK', max_val
 
@@ -375,7 +612,9 @@ def find_and_click(
 def check_template_visible(
     window_id: int,
     template_path: Path,
-    threshold: Optional[float] = None
+    threshold: Optional[float] = None,
+    screenshot_gray: Optional[np.ndarray] = None,
+    rect: Optional[Tuple[int, int, int, int]] = None
 ) -> Tuple[bool, float]:
     """
     Verifica se um template esta visivel na janela SEM clicar.
@@ -384,37 +623,32 @@ def check_template_visible(
         window_id: ID da janela alvo
         template_path: Caminho para o arquivo de imagem do template
         threshold: Threshold de deteccao (0.0 a 1.0). Se None, usa MATCH_THRESHOLD
+        screenshot_gray: Captura ja feita da janela em cinza (evita recapturar
+                         quando varios templates usam a mesma janela). Se None, captura
+        rect: Rect da janela ja obtido pelo chamador. Se None, consulta
 
     Returns:
         Tupla (visivel, percentual_match)
     """
     try:
-        # Captura janela
-        screenshot_bgr = capture_window(window_id)
-        if screenshot_bgr is None:
-            return False, 0.0
+        if rect is None:
+            rect = get_window_rect(window_id)
 
-        screenshot_gray = cv2.cvtColor(screenshot_bgr, cv2.COLOR_BGR2GRAY)
-
-        template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
+        # Captura janela direto em cinza (ou usa a captura recebida)
+        if screenshot_gray is None:
+            screenshot_gray = capture_window_gray(window_id, rect)
+        if screenshot_gray is None:
             return False, 0.0
 
-        # Calcula escala baseado no DPI do template vs DPI da janela
-        template_dpi = get_template_dpi(template_path)
-        window_dpi = get_window_dpi_scale(window_id)
-        dpi_scale = window_dpi / template_dpi
-
-        if abs(dpi_scale - 1.0) > 0.05:
-            new_w = int(template.shape[1] * dpi_scale)
-            new_h = int(template.shape[0] * dpi_scale)
-            template = cv2.resize(template, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        loaded = _load_template(template_path, get_window_dpi_scale(window_id, rect))
+        if loaded is None:
+            return False, 0.0
+        template = loaded.template
 
         if template.shape[0] > screenshot_gray.shape[0] or template.shape[1] > screenshot_gray.shape[1]:
             return False, 0.0
 
-        result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, _ = cv2.minMaxLoc(result)
+        max_val, _ = match_template(screenshot_gray, loaded)
 
         # Usa threshold passado ou o global
         match_threshold = threshold if threshold is not None else MATCH_THRESHOLD
@@ -445,30 +679,19 @@ def find_template_location(
         if not rect:
             return None
 
-        screenshot_bgr = capture_window(window_id)
-        if screenshot_bgr is None:
+        screenshot_gray = capture_window_gray(window_id, rect)
+        if screenshot_gray is None:
             return None
-        screenshot_gray = cv2.cvtColor(screenshot_bgr, cv2.COLOR_BGR2GRAY)
 
-        template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
+        loaded = _load_template(template_path, get_window_dpi_scale(window_id, rect))
+        if loaded is None:
             return None
-
-        # Calcula escala baseado no DPI do template vs DPI da janela
-        template_dpi = get_template_dpi(template_path)
-        window_dpi = get_window_dpi_scale(window_id)
-        dpi_scale = window_dpi / template_dpi
-
-        if abs(dpi_scale - 1.0) > 0.05:
-            new_w = int(template.shape[1] * dpi_scale)
-            new_h = int(template.shape[0] * dpi_scale)
-            template = cv2.resize(template, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        template = loaded.template
 
         if template.shape[0] > screenshot_gray.shape[0] or template.shape[1] > screenshot_gray.shape[1]:
             return None
 
-        result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        max_val, max_loc = match_template(screenshot_gray, loaded)
 
         if max_val >= MATCH_THRESHOLD:
             h, w = template.shape
@@ -37,7 +37,7 @@ class Profile:
                 title = task.get("window_title", "")
                 # Pega apenas a primeira parte do título para display
                 if title:
-                    windows.add(title.split(" - ")[0][:20])
+                    windows.add(title.partition(" - ")[0][:20])
         return sorted(list(windows))
 
     def to_dict(self) -> dict:
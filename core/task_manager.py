@@ -4,22 +4,30 @@ Suporta tasks simples (clique único) e prompt handlers (múltiplas opções).
 """
 
 import gc
+import heapq
+import itertools
 import json
+import os
+import sys
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-from .image_matcher import find_and_click, check_template_visible
+from .image_matcher import find_and_click, check_template_visible, capture_window_gray
 from .window_utils import (
     find_window_by_title, find_window_by_process,
     find_all_windows_by_title, find_all_windows_by_process,
-    get_window_title
+    get_window_rect, get_window_title
 )
 
+# __slots__ via dataclass só está disponível a partir do Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class Task:
     """Representa uma tarefa de automação."""
 
@@ -112,6 +120,14 @@ class Task:
             return find_all_windows_by_title(self.window_title)
 
 
+# Após esta sequência de ciclos sem mudança, o intervalo dobra (até o fator máximo)
+BACKOFF_MISS_STREAK = 5
+BACKOFF_MAX_FACTOR = 4
+
+# Campos que update_task pode alterar (evita hasattr por chamada)
+_UPDATABLE_FIELDS = frozenset(f.name for f in fields(Task))
+
+
 class TaskManager:
     """Gerencia execução paralela de múltiplas tasks."""
 
@@ -135,14 +151,24 @@ class TaskManager:
         self.tasks: Dict[int, Task] = {}
         self.running = False
         self.executor: Optional[ThreadPoolExecutor] = None
+        self._window_executor: Optional[ThreadPoolExecutor] = None  # Busca multi-janela
+        # Agendador: heap de (horario, seq, task, stop_event) despachado para o executor
+        self._schedule_heap: List[tuple] = []
+        self._schedule_seq = itertools.count()
+        self._schedule_cond = threading.Condition()
+        self._scheduler_thread: Optional[threading.Thread] = None
         self.task_threads: Dict[int, threading.Event] = {}
         self.on_status_update = on_status_update
         self.on_log = on_log
         self.on_execution = on_execution
+        self.log_enabled = True  # False suprime (e não formata) mensagens de log
         self._next_id = 1
         self._lock = threading.RLock()  # RLock para permitir reentrância
         self._threads_lock = threading.RLock()  # Lock separado para task_threads
         self._last_log_status: Dict[int, str] = {}  # Guarda último status logado por task
+        self._miss_streak: Dict[int, int] = {}  # Ciclos seguidos sem mudança (back-off)
+        # Último frame sem prompt por (task_id, hwnd): (hash, config, best_match)
+        self._last_frame_hash: Dict[Tuple[int, int], Tuple[int, tuple, float]] = {}
 
     def add_task(
         self,
@@ -249,6 +275,7 @@ class TaskManager:
             if task_id in self.task_threads:
                 self.task_threads[task_id].set()  # Sinaliza para parar
                 del self.task_threads[task_id]
+            self._clear_frame_cache(task_id)
         with self._lock:
             if task_id in self.tasks:
                 del self.tasks[task_id]
@@ -267,7 +294,7 @@ class TaskManager:
             if task_id in self.tasks:
                 task = self.tasks[task_id]
                 for key, value in kwargs.items():
-                    if hasattr(task, key):
+                    if key in _UPDATABLE_FIELDS:
                         setattr(task, key, value)
 
     def set_selected_option(self, task_id: int, option_index: int):
@@ -293,12 +320,12 @@ class TaskManager:
                 self._log("Nenhuma task habilitada!")
                 return
 
-            self.executor = ThreadPoolExecutor(max_workers=len(enabled_tasks) + 1)
+            self._ensure_scheduler()
 
             for task in enabled_tasks:
                 stop_event = threading.Event()
                 self.task_threads[task.id] = stop_event
-                self.executor.submit(self._run_task, task, stop_event)
+                self._start_task(task, stop_event)
                 self._log(f"Task #{task.id} iniciada")
 
     def start_single(self, task_id: int):
@@ -315,13 +342,11 @@ class TaskManager:
                 return
 
             self.running = True
-
-            if not self.executor:
-                self.executor = ThreadPoolExecutor(max_workers=10)
+            self._ensure_scheduler()
 
             stop_event = threading.Event()
             self.task_threads[task_id] = stop_event
-            self.executor.submit(self._run_task, task, stop_event)
+            self._start_task(task, stop_event)
 
     def stop_single(self, task_id: int) -> bool:
         """Para execução de uma única task."""
@@ -330,9 +355,14 @@ class TaskManager:
                 self.task_threads[task_id].set()  # Sinaliza para parar
                 del self.task_threads[task_id]
                 self._last_log_status.pop(task_id, None)  # Limpa histórico de log
+                self._clear_frame_cache(task_id)
+                self._miss_streak.pop(task_id, None)
                 self._log(f"Task #{task_id} parada")
                 if task_id in self.tasks:
                     self._update_status(self.tasks[task_id], "Parado")
+                # Acorda o agendador para finalizar a task se estiver aguardando intervalo
+                with self._schedule_cond:
+                    self._schedule_cond.notify()
                 return True
             return False
 
@@ -352,133 +382,384 @@ class TaskManager:
 
             self.task_threads.clear()
             self._last_log_status.clear()  # Limpa histórico de log
+            self._last_frame_hash.clear()
+            self._miss_streak.clear()
 
             if self.executor:
                 self.executor.shutdown(wait=False)
                 self.executor = None
 
-    def _run_task(self, task: Task, stop_event: threading.Event):
-        """Executa uma task individual em loop."""
-        self._log(f"Task #{task.id}: Thread iniciada")
-
-        while not stop_event.is_set() and self.running:
-            import time
-            start_time = time.time()
-
-            # Busca TODAS as janelas que correspondem ao padrão
-            # Por padrão, ignora janelas minimizadas (não podem ser capturadas)
-            all_windows = task.find_all_windows()
-
-            if not all_windows:
-                self._update_status(task, "Janela?")
-                # Log diferente dependendo do método (apenas se mudou desde o último log)
-                status_key = "window_not_found"
-                if self._last_log_status.get(task.id) != status_key:
-                    if task.window_method == "process":
-                        self._log(f"Task #{task.id}: Processo '{task.process_name}' não encontrado (ou janelas minimizadas)")
-                    else:
-                        self._log(f"Task #{task.id}: Janela '{task.window_title[:30]}' não encontrada (ou minimizada)")
-                    self._last_log_status[task.id] = status_key
-                if not task.repeat:
-                    break
-                stop_event.wait(2)
-                continue
+            # Acorda o agendador para finalizar as tasks que aguardam intervalo
+            with self._schedule_cond:
+                self._schedule_cond.notify()
 
-            # Busca template em TODAS as janelas (para quando há múltiplas instâncias)
-            success = False
-            match = 0.0
-            num_windows = len(all_windows)
-            best_window_title = ""
+            if self._window_executor:
+                self._window_executor.shutdown(wait=False)
+                self._window_executor = None
 
-            # Reseta status de "janela não encontrada" quando encontrar janelas
-            if self._last_log_status.get(task.id) == "window_not_found":
-                self._last_log_status.pop(task.id, None)
+    def _ensure_scheduler(self):
+        """
+        Cria o pool de workers e a thread do agendador, se necessário.
 
-            self._update_status(task, f"Buscando ({num_windows})...")
+        O pool tem tamanho fixo: cada task não ocupa um worker enquanto
+        espera o intervalo, apenas durante a execução de um ciclo.
+        """
+        if not self.executor:
+            workers = max(2, min(os.cpu_count() or 4, 8))
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tm-worker")
+
+        with self._schedule_cond:
+            if self._scheduler_thread is None:
+                self._scheduler_thread = threading.Thread(
+                    target=self._scheduler_loop, name="tm-scheduler", daemon=True
+                )
+                self._scheduler_thread.start()
+
+    def _start_task(self, task: Task, stop_event: threading.Event):
+        """Agenda o primeiro ciclo de uma task."""
+        self._log("Task #{}: Thread iniciada", task.id)
+        self._schedule(task, stop_event, 0.0)
+
+    def _schedule(self, task: Task, stop_event: threading.Event, delay: float):
+        """Agenda o próximo ciclo da task para daqui a `delay` segundos."""
+        with self._schedule_cond:
+            heapq.heappush(
+                self._schedule_heap,
+                (time.monotonic() + delay, next(self._schedule_seq), task, stop_event)
+            )
+            self._schedule_cond.notify()
+
+    def _scheduler_loop(self):
+        """Despacha os ciclos das tasks para o pool conforme o horário agendado."""
+        while True:
+            stopped = []
+            due = None
+            with self._schedule_cond:
+                pending = [e for e in self._schedule_heap if not e[3].is_set() and self.running]
+                if len(pending) != len(self._schedule_heap):
+                    stopped = [e for e in self._schedule_heap if e[3].is_set() or not self.running]
+                    heapq.heapify(pending)
+                    self._schedule_heap = pending
+                elif pending:
+                    wait = pending[0][0] - time.monotonic()
+                    if wait <= 0:
+                        due = heapq.heappop(self._schedule_heap)
+                    else:
+                        self._schedule_cond.wait(wait)
+                elif not self.running:
+                    self._scheduler_thread = None
+                    return
+                else:
+                    self._schedule_cond.wait()
+
+            for _, _, task, _ in stopped:
+                self._finish_task(task)
+
+            if due:
+                _, _, task, stop_event = due
+                executor = self.executor
+                try:
+                    if executor is None:
+                        raise RuntimeError("executor encerrado")
+                    executor.submit(self._run_scheduled_tick, task, stop_event)
+                except RuntimeError:
+                    self._finish_task(task)
+
+    def _run_scheduled_tick(self, task: Task, stop_event: threading.Event):
+        """Executa um ciclo da task no pool e agenda o próximo (ou finaliza)."""
+        delay = None
+        try:
+            if not stop_event.is_set() and self.running:
+                delay = self._run_task_tick(task, stop_event)
+        finally:
+            if delay is None or stop_event.is_set() or not self.running:
+                self._finish_task(task)
+            else:
+                # Libera memoria periodicamente para evitar vazamento
+                gc.collect()
+                self._schedule(task, stop_event, delay)
 
-            for i, hwnd in enumerate(all_windows):
-                if stop_event.is_set():
-                    break
+    def _finish_task(self, task: Task):
+        """Marca a task como parada."""
+        self._update_status(task, "Parado")
+        self._log("Task #{}: Thread parada", task.id)
 
-                task.hwnd = hwnd
-                window_title = get_window_title(hwnd)
+    def _run_task_tick(self, task: Task, stop_event: threading.Event) -> Optional[float]:
+        """
+        Executa um ciclo de uma task.
 
-                # Executa de acordo com o tipo de task
-                if task.task_type == "prompt_handler":
-                    found, m = self._run_prompt_handler(task, stop_event)
+        Returns:
+            Segundos até o próximo ciclo, ou None se a task terminou
+        """
+        start_time = time.time()
+
+        # Busca TODAS as janelas que correspondem ao padrão
+        # Por padrão, ignora janelas minimizadas (não podem ser capturadas)
+        all_windows = task.find_all_windows()
+
+        if not all_windows:
+            self._update_status(task, "Janela?")
+            # Log diferente dependendo do método (apenas se mudou desde o último log)
+            status_key = "window_not_found"
+            if self._last_log_status.get(task.id) != status_key:
+                if task.window_method == "process":
+                    self._log("Task #{}: Processo '{}' não encontrado (ou janelas minimizadas)", task.id, task.process_name)
                 else:
-                    found, m = self._run_simple_task(task)
-
-                if found:
-                    success = True
-                    match = m
-                    best_window_title = window_title
-                    break  # Encontrou em uma janela, para de buscar
-                elif m > match:
-                    match = m  # Guarda o melhor match encontrado
-                    best_window_title = window_title
-
-            # Calcula tempo de execução
-            elapsed_ms = (time.time() - start_time) * 1000
-
-            # Notifica execução para estatísticas
-            if self.on_execution:
-                self.on_execution(task.id, success, elapsed_ms)
-
-            if success:
-                self._update_status(task, f"{match:.0%}")
-            else:
-                self._update_status(task, f"{match:.0%}")
-                # Log detalhado quando não encontra (apenas se mudou desde o último log)
-                status_key = f"not_found_{match:.2f}_{best_window_title[:20]}"
-                if self._last_log_status.get(task.id) != status_key:
-                    # Trunca título para 30 caracteres
-                    short_title = best_window_title[:30] + "…" if len(best_window_title) > 30 else best_window_title
-                    self._log(f"⚠️ Task #{task.id}: NÃO ENCONTRADO")
-                    self._log(f"Melhor match: {match:.0%} em '{short_title}' (threshold: {task.threshold:.0%})")
-                    self._last_log_status[task.id] = status_key
-
+                    self._log("Task #{}: Janela '{}' não encontrada (ou minimizada)", task.id, task.window_title[:30])
+                self._last_log_status[task.id] = status_key
             if not task.repeat:
-                self._log(f"Task #{task.id}: Execução única finalizada")
+                return None
+            return 2.0
+
+        # Busca template em TODAS as janelas (para quando há múltiplas instâncias)
+        success = False
+        match = 0.0
+        num_windows = len(all_windows)
+        best_window_title = ""
+
+        # Reseta status de "janela não encontrada" quando encontrar janelas
+        if self._last_log_status.get(task.id) == "window_not_found":
+            self._last_log_status.pop(task.id, None)
+
+        self._update_status(task, f"Buscando ({num_windows})...")
+
+        # Com múltiplas janelas, a detecção roda em paralelo (matchTemplate
+        # libera o GIL) e o clique acontece uma única vez, na melhor janela
+        if num_windows > 1:
+            results = self._check_windows_parallel(task, all_windows, stop_event)
+        else:
+            results = (self._check_window(task, all_windows[0], stop_event),)
+
+        for hwnd, found, m, window_title in results:
+            if stop_event.is_set():
                 break
 
-            # Aguarda intervalo
-            self._update_status(task, f"{task.interval}s")
-            stop_event.wait(task.interval)
+            if found:
+                success = True
+                match = m
+                best_window_title = window_title
+                task.hwnd = hwnd
+                break  # Clicou na janela escolhida
+            elif m > match:
+                match = m  # Guarda o melhor match encontrado
+                best_window_title = window_title
 
-            # Libera memoria periodicamente para evitar vazamento
-            gc.collect()
+        # Calcula tempo de execução
+        elapsed_ms = (time.time() - start_time) * 1000
 
-        self._update_status(task, "Parado")
-        self._log(f"Task #{task.id}: Thread parada")
+        # Notifica execução para estatísticas
+        if self.on_execution:
+            self.on_execution(task.id, success, elapsed_ms)
+
+        changed = success
+        if success:
+            self._update_status(task, f"{match:.0%}")
+        else:
+            self._update_status(task, f"{match:.0%}")
+            # Log detalhado quando não encontra (apenas se mudou desde o último log)
+            status_key = f"not_found_{match:.2f}_{best_window_title[:20]}"
+            if self._last_log_status.get(task.id) != status_key:
+                changed = True
+                # Trunca título para 30 caracteres
+                short_title = best_window_title[:30] + "…" if len(best_window_title) > 30 else best_window_title
+                self._log("⚠️ Task #{}: NÃO ENCONTRADO", task.id)
+                self._log("Melhor match: {:.0%} em '{}' (threshold: {:.0%})", match, short_title, task.threshold)
+                self._last_log_status[task.id] = status_key
+
+        if not task.repeat:
+            self._log("Task #{}: Execução única finalizada", task.id)
+            return None
+
+        # Aguarda intervalo
+        interval = self._next_interval(task, changed)
+        self._update_status(task, f"{interval}s")
+        return interval
+
+    def _next_interval(self, task: Task, changed: bool) -> float:
+        """
+        Calcula o intervalo até o próximo ciclo com back-off exponencial.
+
+        A cada BACKOFF_MISS_STREAK ciclos seguidos sem mudança o intervalo
+        dobra, até BACKOFF_MAX_FACTOR vezes o intervalo da task.
+        Qualquer mudança (clique ou match diferente) volta ao intervalo normal.
+        """
+        if changed:
+            self._miss_streak[task.id] = 0
+            return task.interval
+
+        streak = self._miss_streak.get(task.id, 0) + 1
+        self._miss_streak[task.id] = streak
+        factor = min(2 ** (streak // BACKOFF_MISS_STREAK), BACKOFF_MAX_FACTOR)
+        return task.interval * factor
+
+    def _get_window_executor(self) -> Optional[ThreadPoolExecutor]:
+        """Retorna o pool usado na busca multi-janela (cria se não existir).
+
+        Separado do executor das tasks: um ciclo esperando buscas enfileiradas
+        no próprio pool (de tamanho fixo) poderia travar.
+
+        Retorna None depois de stop(): um ciclo ainda em andamento não pode
+        recriar um pool que ninguém mais encerraria.
+        """
+        with self._threads_lock:
+            if not self.running:
+                return None
+            if self._window_executor is None:
+                self._window_executor = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 4,
+                    thread_name_prefix="tm-window"
+                )
+            return self._window_executor
+
+    def _check_window(self, task: Task, hwnd: int, stop_event: threading.Event,
+                      detection: Optional[tuple] = None) -> tuple:
+        """
+        Executa a task em uma janela específica (busca e clica).
+
+        Roda na thread do ciclo: na busca multi-janela só é chamada para a
+        janela escolhida após a detecção paralela.
+
+        Args:
+            detection: Resultado de _detect_window para esta janela; a captura
+                       e a verificação já feitas são reaproveitadas no clique
+
+        Returns:
+            Tupla (hwnd, encontrou, match, titulo_janela)
+        """
+        if stop_event.is_set():
+            return hwnd, False, 0.0, ""
+
+        if detection is not None:
+            _, visible, m, window_title, frame, prompt_detail = detection
+        else:
+            window_title = get_window_title(hwnd)
+            frame = None
+
+        # Executa de acordo com o tipo de task
+        if task.task_type == "prompt_handler":
+            visibility = None
+            if detection is not None:
+                visibility = (visible, m) + prompt_detail + (frame,)
+            found, m = self._run_prompt_handler(task, hwnd, stop_event, visibility=visibility)
+        else:
+            found, m = self._run_simple_task(task, hwnd, screenshot_gray=frame)
+
+        return hwnd, found, m, window_title
+
+    def _detect_window(self, task: Task, hwnd: int, stop_event: threading.Event) -> tuple:
+        """
+        Verifica, sem clicar, se o alvo da task está visível na janela.
+
+        Roda nas threads da busca multi-janela: não altera status nem logs
+        (o relatório e o clique ficam na thread do ciclo).
+
+        Returns:
+            Tupla (hwnd, visivel, match, titulo_janela, frame, detalhe_prompt)
+            onde frame é a captura em cinza (só quando visível, para o clique
+            reaproveitar) e detalhe_prompt é (opcoes_visiveis, templates_ausentes)
+            ou None
+        """
+        if stop_event.is_set():
+            return hwnd, False, 0.0, "", None, None
+
+        window_title = get_window_title(hwnd)
+
+        if task.task_type == "prompt_handler":
+            visible, m, visible_count, missing, frame = self._prompt_visibility(task, hwnd, stop_event)
+            prompt_detail = (visible_count, missing)
+        else:
+            prompt_detail = None
+            template_path = self.images_dir / f"{task.image_name}.png"
+            rect = get_window_rect(hwnd)
+            frame = capture_window_gray(hwnd, rect) if rect else None
+            if frame is None:
+                visible, m = False, 0.0
+            else:
+                visible, m = check_template_visible(
+                    hwnd, template_path, threshold=task.threshold,
+                    screenshot_gray=frame, rect=rect
+                )
+
+        # O frame é um buffer desta thread do pool, reutilizado na próxima
+        # captura dela: copia apenas o que pode virar clique
+        frame = frame.copy() if visible and frame is not None else None
+        return hwnd, visible, m, window_title, frame, prompt_detail
+
+    def _has_templates(self, task: Task) -> bool:
+        """Indica se a task tem o que procurar (opções / imagem existente)."""
+        if task.task_type == "prompt_handler":
+            return bool(task.options)
+        return (self.images_dir / f"{task.image_name}.png").exists()
+
+    def _check_windows_parallel(self, task: Task, windows: List[int], stop_event: threading.Event) -> list:
+        """
+        Verifica várias janelas: a detecção (sem clique) roda em paralelo e a
+        ação é executada uma única vez, nesta thread, na janela com melhor match.
 
-    def _run_simple_task(self, task: Task, silent: bool = False) -> tuple:
+        Returns:
+            Lista de (hwnd, encontrou, match, titulo_janela); apenas a entrada
+            da janela clicada (a primeira, se houver) pode ter encontrou=True
+        """
+        # Configuração inválida: o caminho de uma janela já reporta o problema
+        if not self._has_templates(task):
+            return [self._check_window(task, windows[0], stop_event)]
+
+        executor = self._get_window_executor()
+        if executor is None:  # TaskManager parado durante o ciclo
+            return []
+        try:
+            futures = [executor.submit(self._detect_window, task, hwnd, stop_event) for hwnd in windows]
+        except RuntimeError:  # Pool encerrado por stop() durante o ciclo
+            return []
+        detections = [future.result() for future in futures]
+
+        results = [(hwnd, False, m, title) for hwnd, _, m, title, _, _ in detections]
+        if stop_event.is_set():
+            return results
+
+        visible = [d for d in detections if d[1]]
+        if visible:
+            # Clica a partir da captura/verificação da própria detecção
+            target = max(visible, key=lambda d: d[2])
+            results.insert(0, self._check_window(task, target[0], stop_event, detection=target))
+        elif task.task_type == "prompt_handler":
+            # Relata o estado da janela com mais opções visíveis
+            visible_count, missing = max(detections, key=lambda d: d[5][0])[5]
+            self._report_prompt_visibility(task, visible_count, missing)
+
+        return results
+
+    def _run_simple_task(self, task: Task, hwnd: int, silent: bool = False,
+                         screenshot_gray=None) -> tuple:
         """
         Executa uma task simples (busca uma imagem e clica).
 
         Args:
             task: Task a executar
+            hwnd: ID da janela onde buscar
             silent: Se True, não gera logs de "não encontrou" (usado em busca multi-janela)
+            screenshot_gray: Captura em cinza já feita da janela. Se None, captura
         """
         template_path = self.images_dir / f"{task.image_name}.png"
         if not template_path.exists():
             if not silent:
                 self._update_status(task, "Img?")
-                self._log(f"Task #{task.id}: Imagem '{task.image_name}' não existe")
+                self._log("Task #{}: Imagem '{}' não existe", task.id, task.image_name)
             return False, 0.0
 
         # Executa busca (sem debug_callback para evitar logs excessivos)
         success, msg, match = find_and_click(
-            task.hwnd, template_path, task.action,
-            threshold=task.threshold
+            hwnd, template_path, task.action,
+            threshold=task.threshold, screenshot_gray=screenshot_gray
         )
 
         if success:
-            self._log(f"Task #{task.id}: Clicou! ({match:.0%})")
+            self._log("Task #{}: Clicou! ({:.0%})", task.id, match)
 
         return success, match
 
-    def _run_prompt_handler(self, task: Task, stop_event: threading.Event, silent: bool = False) -> tuple:
+    def _run_prompt_handler(self, task: Task, hwnd: int, stop_event: threading.Event, silent: bool = False,
+                            visibility: Optional[tuple] = None) -> tuple:
         """
         Executa uma task do tipo prompt_handler.
         1. Verifica se TODAS as opções estão visíveis (confirma que é o prompt correto)
@@ -486,48 +767,30 @@ class TaskManager:
 
         Args:
             task: Task a executar
+            hwnd: ID da janela onde buscar
             stop_event: Evento de parada
             silent: Se True, não gera logs de "não encontrou" (usado em busca multi-janela)
+            visibility: Resultado de _prompt_visibility já calculado (busca
+                        multi-janela). Se None, verifica agora
         """
         if not task.options:
             if not silent:
-                self._log(f"Task #{task.id}: Nenhuma opção configurada")
+                self._log("Task #{}: Nenhuma opção configurada", task.id)
             return False, 0.0
 
-        # Verifica se TODAS as opções estão visíveis (garante que é o prompt correto)
-        all_visible = True
-        best_match = 0.0
-        visible_count = 0
-        total_options = len(task.options)
-
-        for opt in task.options:
-            if stop_event.is_set():
-                return False, 0.0
-            template_path = self.images_dir / f"{opt['image']}.png"
-            if template_path.exists():
-                visible, match = check_template_visible(task.hwnd, template_path, threshold=task.threshold)
-                if match > best_match:
-                    best_match = match
-                if visible:
-                    visible_count += 1
-                else:
-                    all_visible = False
-            else:
-                all_visible = False
-                if not silent:
-                    self._log(f"Task #{task.id}: Template '{opt['image']}' não encontrado")
+        if visibility is None:
+            visibility = self._prompt_visibility(task, hwnd, stop_event)
+        all_visible, best_match, visible_count, missing, frame = visibility
 
         if not all_visible:
-            # Log parcial se algumas foram encontradas (apenas se mudou desde o último log)
-            if visible_count > 0 and not silent:
-                status_key = f"partial_{visible_count}_{total_options}"
-                if self._last_log_status.get(task.id) != status_key:
-                    self._log(f"Task #{task.id}: {visible_count}/{total_options} opções visíveis (aguardando todas)")
-                    self._last_log_status[task.id] = status_key
+            if not silent:
+                self._report_prompt_visibility(task, visible_count, missing)
             return False, best_match
 
+        total_options = len(task.options)
+
         # Todas as opções visíveis - prompt confirmado!
-        self._log(f"Task #{task.id}: Prompt confirmado! ({total_options}/{total_options} opções visíveis)")
+        self._log("Task #{}: Prompt confirmado! ({}/{} opções visíveis)", task.id, total_options, total_options)
         # Reseta status de log para permitir novos logs quando voltar ao estado parcial
         self._last_log_status.pop(task.id, None)
 
@@ -542,30 +805,118 @@ class TaskManager:
         if not selected_template.exists():
             if not silent:
                 self._update_status(task, "Img?")
-                self._log(f"Task #{task.id}: Imagem da opção '{selected_opt['name']}' não existe")
+                self._log("Task #{}: Imagem da opção '{}' não existe", task.id, selected_opt['name'])
             return False, best_match
 
         self._update_status(task, f"{selected_opt['name']}")
+        # Clica usando o mesmo frame em que as opções foram confirmadas
         success, msg, match = find_and_click(
-            task.hwnd, selected_template, task.action,
-            threshold=task.threshold
+            hwnd, selected_template, task.action,
+            threshold=task.threshold, screenshot_gray=frame
         )
 
         if success:
-            self._log(f"Task #{task.id}: Clicou em '{selected_opt['name']}' ({match:.0%})")
+            self._log("Task #{}: Clicou em '{}' ({:.0%})", task.id, selected_opt['name'], match)
 
         return success, match if success else best_match
 
+    def _prompt_visibility(self, task: Task, hwnd: int, stop_event: threading.Event) -> tuple:
+        """
+        Verifica quais opções do prompt estão visíveis na janela (sem clicar
+        e sem logs; seguro nas threads da busca multi-janela).
+
+        Returns:
+            Tupla (todas_visiveis, melhor_match, opcoes_visiveis, templates_ausentes, frame)
+            onde frame é a captura em cinza (buffer da thread) ou None
+        """
+        # Captura a janela uma vez (já em cinza) e reutiliza frame e rect
+        # para todas as opções
+        rect = get_window_rect(hwnd)
+        if not rect:
+            return False, 0.0, 0, (), None
+        screenshot = capture_window_gray(hwnd, rect)
+        if screenshot is None:
+            return False, 0.0, 0, (), None
+
+        # Frame idêntico ao da última verificação sem prompt: reaproveita o resultado
+        frame_hash = hash(screenshot[::8, ::8].tobytes())
+        frame_config = (tuple(opt['image'] for opt in task.options), task.threshold)
+        cache_key = (task.id, hwnd)
+        cached = self._last_frame_hash.get(cache_key)
+        if cached and cached[0] == frame_hash and cached[1] == frame_config:
+            return False, cached[2], 0, (), None
+
+        # Verifica se TODAS as opções estão visíveis (garante que é o prompt correto)
+        all_visible = True
+        best_match = 0.0
+        visible_count = 0
+        missing = []
+
+        for opt in task.options:
+            if stop_event.is_set():
+                return False, 0.0, 0, (), None
+            template_path = self.images_dir / f"{opt['image']}.png"
+            if template_path.exists():
+                visible, match = check_template_visible(
+                    hwnd, template_path, threshold=task.threshold,
+                    screenshot_gray=screenshot, rect=rect
+                )
+                if match > best_match:
+                    best_match = match
+                if visible:
+                    visible_count += 1
+                else:
+                    all_visible = False
+            else:
+                all_visible = False
+                missing.append(opt['image'])
+
+        if all_visible:
+            self._last_frame_hash.pop(cache_key, None)
+        else:
+            self._last_frame_hash[cache_key] = (frame_hash, frame_config, best_match)
+
+        return all_visible, best_match, visible_count, missing, screenshot
+
+    def _report_prompt_visibility(self, task: Task, visible_count: int, missing):
+        """Loga templates ausentes e prompt parcialmente visível (thread do ciclo)."""
+        for image in missing:
+            self._log("Task #{}: Template '{}' não encontrado", task.id, image)
+
+        # Log parcial se algumas foram encontradas (apenas se mudou desde o último log)
+        if visible_count > 0:
+            total_options = len(task.options)
+            status_key = f"partial_{visible_count}_{total_options}"
+            if self._last_log_status.get(task.id) != status_key:
+                self._log("Task #{}: {}/{} opções visíveis (aguardando todas)", task.id, visible_count, total_options)
+                self._last_log_status[task.id] = status_key
+
+    def _clear_frame_cache(self, task_id: int):
+        """Descarta os frames em cache de uma task."""
+        for key in list(self._last_frame_hash):
+            if key[0] == task_id:
+                self._last_frame_hash.pop(key, None)
+
     def _update_status(self, task: Task, status: str):
-        """Atualiza status da task."""
+        """Atualiza status da task (só notifica a UI se o status mudou)."""
+        if status == task.last_status:
+            return
         task.last_status = status
         if self.on_status_update:
             self.on_status_update(task.id, status)
 
-    def _log(self, msg: str):
-        """Envia mensagem para log."""
-        if self.on_log:
-            self.on_log(msg)
+    def _log(self, msg: str, *args):
+        """
+        Envia mensagem para log.
+
+        Se `args` for fornecido, `msg` é um template str.format formatado
+        apenas quando o log está ativo (evita montar strings descartadas).
+        """
+        if not self.log_enabled or not self.on_log:
+            return
+        if args:
+            msg = msg.format(*args)
+        self.on_log(msg)
 
     def save_tasks(self, filepath: Path):
         """Salva tasks em JSON."""
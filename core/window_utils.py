@@ -5,13 +5,18 @@ Funcoes para encontrar, listar e obter informacoes de janelas.
 Usa Quartz (CoreGraphics) e AppKit via PyObjC.
 """
 
-from typing import List, Optional, Tuple
+import functools
+import re
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import Quartz
 from AppKit import NSScreen, NSWorkspace
 from Quartz import (
     CGWindowListCopyWindowInfo,
     kCGNullWindowID,
+    kCGWindowListOptionIncludingWindow,
     kCGWindowListOptionOnScreenOnly,
     kCGWindowListExcludeDesktopElements,
     kCGWindowListOptionAll,
@@ -20,26 +25,195 @@ from Quartz import (
 
 # Cache para informacoes de janelas (atualizado em get_windows)
 _window_cache: dict = {}
+# Indice window_id -> titulo exibido (atualizado em get_windows)
+_title_cache: dict = {}
 
+# Cache do CGWindowListCopyWindowInfo por (on_screen_only, include_all_spaces)
+# Idade maxima padrao: titulos, posicao e minimizar mudam sem notificacao,
+# entao buscas da automacao e hit-tests so agrupam chamadas em sequencia
+_WINDOW_STATE_TTL = 0.1  # segundos
+# Idade maxima da listagem completa para a UI (get_windows), usada apenas
+# depois que as notificacoes do NSWorkspace comecam a chegar (ver
+# _observe_window_changes); elas descartam a lista quando apps mudam
+_WINDOW_LIST_TTL = 5.0  # segundos
+_window_list_cache: dict = {}
 
+# True apos a primeira notificacao do NSWorkspace (ha run loop entregando)
+_window_notifications_seen = False
+
+
+# Entradas pre-processadas (titulos/owners ja em minusculas) por lista em cache
+_window_entries_cache: dict = {}
+
+# Arrays de geometria derivados da ultima lista usada em hit-tests
+_window_geometry_cache: dict = {}
+
+# Listas filtradas/ordenadas de _list_windows por include_minimized
+_sorted_windows_cache: dict = {}
+
+# Tokens dos observers do NSWorkspace (mantidos vivos enquanto o modulo existir)
+_window_observers: list = []
+
+# Donos de janelas do sistema ignorados nos hit-tests (Dock, Menu Bar, etc)
+SYSTEM_WINDOW_OWNERS = frozenset({'Window Server', 'Dock', 'SystemUIServer'})
+
+
+def invalidate_window_cache():
+    """Descarta a lista de janelas em cache (ex: ao atualizar a lista na UI)."""
+    _window_cache.clear()
+    _title_cache.clear()
+    _window_list_cache.clear()
+    _window_entries_cache.clear()
+    _window_geometry_cache.clear()
+    _sorted_windows_cache.clear()
+
+
+# Idade maxima da geometria de telas em cache. A notificacao de mudanca de
+# telas precisa de NSApplication com run loop; sem ela (ex: iclick.py tasks)
+# o TTL e o que recarrega escala/DPI apos conectar ou remover um monitor
+_SCREEN_CACHE_TTL = 30.0  # segundos
+_screen_cache_time = 0.0
+
+
+def _expire_screen_cache():
+    """Descarta a geometria de telas em cache se ela passou do TTL."""
+    global _screen_cache_time
+    now = time.monotonic()
+    if now - _screen_cache_time >= _SCREEN_CACHE_TTL:
+        invalidate_screen_cache()
+        _screen_cache_time = now
+
+
+@functools.lru_cache(maxsize=1)
 def _get_main_screen_height() -> float:
-    """Retorna altura da tela principal para conversao de coordenadas."""
+    """
+    Retorna altura da tela principal para conversao de coordenadas.
+
+    O valor fica em cache ate a configuracao de telas mudar ou o TTL
+    expirar (ver invalidate_screen_cache e _expire_screen_cache).
+    """
     main_screen = NSScreen.mainScreen()
     if main_screen:
         return main_screen.frame().size.height
     return 1080  # Fallback
 
 
+@functools.lru_cache(maxsize=1)
+def _get_screen_frames() -> Tuple[Tuple[Tuple[int, int, int, int, float], ...], float]:
+    """
+    Retorna a geometria das telas ja convertida para top-left origin.
+
+    Returns:
+        Tupla (telas, escala_principal), onde telas e uma tupla de
+        (x, y, largura, altura, backingScaleFactor)
+    """
+    screens = []
+    for screen in NSScreen.screens():
+        frame = screen.frame()
+        screens.append((
+            int(frame.origin.x),
+            _convert_y_coordinate(frame.origin.y, frame.size.height),
+            int(frame.size.width),
+            int(frame.size.height),
+            screen.backingScaleFactor(),
+        ))
+    return tuple(screens), NSScreen.mainScreen().backingScaleFactor()
+
+
+def get_main_display_scale() -> float:
+    """Retorna o fator de escala da tela principal (2.0 para Retina), em cache."""
+    try:
+        _expire_screen_cache()
+        return _get_screen_frames()[1]
+    except Exception:
+        return 1.0
+
+
+def invalidate_screen_cache():
+    """Descarta a geometria de telas em cache (ex: monitor conectado/removido)."""
+    _get_main_screen_height.cache_clear()
+    _get_screen_frames.cache_clear()
+
+
+def _observe_screen_changes():
+    """Limpa o cache de telas quando o macOS notifica mudanca de configuracao."""
+    try:
+        from AppKit import NSApplicationDidChangeScreenParametersNotification
+        from Foundation import NSNotificationCenter
+
+        NSNotificationCenter.defaultCenter().addObserverForName_object_queue_usingBlock_(
+            NSApplicationDidChangeScreenParametersNotification,
+            None,
+            None,
+            lambda notification: invalidate_screen_cache()
+        )
+    except Exception:
+        pass  # Sem observer, o cache ainda pode ser limpo manualmente
+
+
+_observe_screen_changes()
+
+
+def _observe_window_changes():
+    """
+    Limpa a lista de janelas em cache quando o NSWorkspace notifica que
+    apps abriram/fecharam/mudaram de Space.
+
+    As notificacoes sao postadas na thread principal e so chegam enquanto
+    o run loop dela roda (GUI Qt). Sem run loop (ex: iclick.py tasks)
+    nenhuma chega e a listagem continua usando _WINDOW_STATE_TTL.
+    """
+    try:
+        from AppKit import (
+            NSWorkspaceActiveSpaceDidChangeNotification,
+            NSWorkspaceDidActivateApplicationNotification,
+            NSWorkspaceDidHideApplicationNotification,
+            NSWorkspaceDidLaunchApplicationNotification,
+            NSWorkspaceDidTerminateApplicationNotification,
+            NSWorkspaceDidUnhideApplicationNotification,
+        )
+
+        center = NSWorkspace.sharedWorkspace().notificationCenter()
+        for name in (
+            NSWorkspaceDidLaunchApplicationNotification,
+            NSWorkspaceDidTerminateApplicationNotification,
+            NSWorkspaceDidActivateApplicationNotification,
+            NSWorkspaceDidHideApplicationNotification,
+            NSWorkspaceDidUnhideApplicationNotification,
+            NSWorkspaceActiveSpaceDidChangeNotification,
+        ):
+            _window_observers.append(center.addObserverForName_object_queue_usingBlock_(
+                name,
+                None,
+                None,
+                _on_window_notification
+            ))
+    except Exception:
+        pass  # Sem observer, o cache ainda expira pelo TTL
+
+
+def _on_window_notification(notification):
+    """Marca que as notificacoes estao chegando e descarta a lista em cache."""
+    global _window_notifications_seen
+    _window_notifications_seen = True
+    invalidate_window_cache()
+
+
+_observe_window_changes()
+
+
 def _convert_y_coordinate(y: float, height: float = 0) -> int:
     """
     Converte coordenada Y do sistema macOS (origem bottom-left)
     para sistema padrao (origem top-left).
     """
+    _expire_screen_cache()
     screen_height = _get_main_screen_height()
     return int(screen_height - y - height)
 
 
-def _get_all_windows_info(on_screen_only: bool = True, include_all_spaces: bool = True) -> list:
+def _get_all_windows_info(on_screen_only: bool = True, include_all_spaces: bool = True,
+                          max_age: float = _WINDOW_STATE_TTL) -> list:
     """
     Obtem informacoes de todas as janelas via Quartz.
 
@@ -47,10 +221,26 @@ def _get_all_windows_info(on_screen_only: bool = True, include_all_spaces: bool
         on_screen_only: Se True, retorna apenas janelas visiveis na tela
         include_all_spaces: Se True, inclui janelas de todos os Spaces (fullscreen)
                            Isso e necessario para capturar janelas em fullscreen no macOS
+        max_age: Idade maxima da lista em cache, em segundos. So a listagem
+                 da UI aceita _WINDOW_LIST_TTL
 
     Returns:
-        Lista de dicionarios com informacoes das janelas
+        Lista de dicionarios com informacoes das janelas.
+        O resultado e compartilhado via cache e nao deve ser modificado.
     """
+    key = (on_screen_only, include_all_spaces)
+    cached = _window_list_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < max_age:
+        return cached[1]
+
+    result = _query_windows_info(on_screen_only, include_all_spaces)
+    _window_list_cache[key] = (now, result)
+    return result
+
+
+def _query_windows_info(on_screen_only: bool, include_all_spaces: bool):
+    """Consulta o WindowServer (sem cache). Ver _get_all_windows_info."""
     # Para incluir janelas fullscreen (outros Spaces), usamos kCGWindowListOptionAll
     # e filtramos manualmente, pois kCGWindowListOptionOnScreenOnly so retorna
     # janelas do Space atual
@@ -61,26 +251,178 @@ def _get_all_windows_info(on_screen_only: bool = True, include_all_spaces: bool
 
     options |= kCGWindowListExcludeDesktopElements
 
+    # Mantem o CFArray retornado (sem copiar para uma lista Python)
     windows = CGWindowListCopyWindowInfo(options, kCGNullWindowID)
-    result = list(windows) if windows else []
+    if not windows:
+        return []
 
     # Se queremos apenas janelas "on screen" mas incluindo outros Spaces,
     # filtramos janelas com dimensoes validas (>0) e layer normal (0)
     if on_screen_only and include_all_spaces:
-        filtered = []
-        for w in result:
-            bounds = w.get('kCGWindowBounds', {})
-            width = bounds.get('Width', 0)
-            height = bounds.get('Height', 0)
-            layer = w.get('kCGWindowLayer', 0)
-            alpha = w.get('kCGWindowAlpha', 1.0)
-
-            # Inclui se tem dimensoes validas, layer normal (0) e alpha > 0
-            if width > 50 and height > 50 and layer == 0 and alpha > 0:
-                filtered.append(w)
-        return filtered
+        return [w for w in windows if _is_on_screen(w)]
 
-    return result
+    return windows
+
+
+def _is_on_screen(window) -> bool:
+    """
+    Verifica se a janela conta como "on screen" (incluindo outros Spaces).
+
+    Inclui se tem dimensoes validas, layer normal (0) e alpha > 0.
+    """
+    bounds = window.get('kCGWindowBounds', {})
+    width = bounds.get('Width', 0)
+    height = bounds.get('Height', 0)
+    layer = window.get('kCGWindowLayer', 0)
+    alpha = window.get('kCGWindowAlpha', 1.0)
+    return width > 50 and height > 50 and layer == 0 and alpha > 0
+
+
+class _WindowEntry(NamedTuple):
+    """Campos de uma janela extraidos uma unica vez do dicionario PyObjC."""
+
+    window_id: int
+    display_title: str  # Titulo, ou owner se o titulo estiver vazio
+    owner: str
+    display_lower: str
+    owner_lower: str
+    on_screen: bool
+    info: object  # Dicionario original do Quartz
+
+
+def _get_window_entries(on_screen_only: bool = True, include_all_spaces: bool = True,
+                        max_age: float = _WINDOW_STATE_TTL) -> List[_WindowEntry]:
+    """
+    Retorna as janelas de _get_all_windows_info como entradas pre-processadas.
+
+    As entradas (com titulo e owner ja em minusculas) sao calculadas uma vez
+    por lista em cache e reaproveitadas pelas buscas por titulo e processo.
+    """
+    windows = _get_all_windows_info(on_screen_only, include_all_spaces, max_age)
+    key = (on_screen_only, include_all_spaces)
+    cached = _window_entries_cache.get(key)
+    if cached and cached[0] is windows:
+        return cached[1]
+
+    entries = []
+    for window in windows:
+        title = window.get('kCGWindowName', '') or ''
+        owner = window.get('kCGWindowOwnerName', '') or ''
+        display_title = title if title else owner
+        entries.append(_WindowEntry(
+            window.get('kCGWindowNumber', 0),
+            display_title,
+            owner,
+            display_title.lower(),
+            owner.lower(),
+            _is_on_screen(window),
+            window,
+        ))
+
+    _window_entries_cache[key] = (windows, entries)
+    return entries
+
+
+def _get_window_geometry(windows) -> dict:
+    """
+    Retorna a geometria das janelas como arrays NumPy paralelos (struct-of-arrays).
+
+    Os arrays sao calculados uma vez por lista de janelas (mesma vida do cache
+    de _get_all_windows_info), permitindo testes geometricos vetorizados sem
+    acessar os dicionarios PyObjC de cada janela.
+
+    Args:
+        windows: Lista retornada por _get_all_windows_info
+
+    Returns:
+        Dicionario com arrays 'x', 'y', 'w', 'h', 'layer' e 'selectable'
+        (False para janelas do sistema, como Dock e Menu Bar)
+    """
+    cached = _window_geometry_cache.get('geometry')
+    if cached and cached[0] is windows:
+        return cached[1]
+
+    rows = []
+    for window in windows:
+        bounds = window.get('kCGWindowBounds', {})
+        rows.append((
+            int(bounds.get('X', 0)),
+            int(bounds.get('Y', 0)),
+            int(bounds.get('Width', 0)),
+            int(bounds.get('Height', 0)),
+            int(window.get('kCGWindowLayer', 0)),
+            window.get('kCGWindowOwnerName', '') not in SYSTEM_WINDOW_OWNERS,
+        ))
+
+    columns = np.array(rows, dtype=np.int64).reshape(-1, 6)
+    geometry = {
+        'x': columns[:, 0],
+        'y': columns[:, 1],
+        'w': columns[:, 2],
+        'h': columns[:, 3],
+        'layer': columns[:, 4],
+        'selectable': columns[:, 5].astype(bool),
+    }
+    _window_geometry_cache['geometry'] = (windows, geometry)
+    return geometry
+
+
+def _window_index_at_point(windows, x: int, y: int) -> Optional[int]:
+    """
+    Encontra a janela mais a frente que contem o ponto (ignorando janelas do sistema).
+
+    Args:
+        windows: Lista retornada por _get_all_windows_info
+        x: Coordenada X (top-left origin)
+        y: Coordenada Y (top-left origin)
+
+    Returns:
+        Indice da janela em `windows` ou None
+    """
+    geo = _get_window_geometry(windows)
+    mask = (
+        geo['selectable']
+        & (geo['x'] <= x) & (x < geo['x'] + geo['w'])
+        & (geo['y'] <= y) & (y < geo['y'] + geo['h'])
+    )
+    if not mask.any():
+        return None
+
+    # kCGWindowLayer: menor = mais na frente; empate mantem a ordem do Quartz
+    layers = np.where(mask, geo['layer'], np.iinfo(np.int64).max)
+    return int(np.argmin(layers))
+
+
+def _find_window_info(window_id: int):
+    """
+    Busca as informacoes de uma unica janela sem consultar a lista inteira.
+
+    Args:
+        window_id: ID da janela
+
+    Returns:
+        Dicionario com informacoes da janela ou None se nao encontrada
+    """
+    # Se a lista completa ainda esta fresca no cache, procura nela
+    cached = _window_list_cache.get((False, True))
+    if cached and time.monotonic() - cached[0] < _WINDOW_STATE_TTL:
+        for window in cached[1]:
+            if window.get('kCGWindowNumber', 0) == window_id:
+                return window
+        return None
+
+    # Caso contrario, pede ao Quartz apenas a descricao desta janela
+    windows = CGWindowListCopyWindowInfo(kCGWindowListOptionIncludingWindow, window_id)
+    if windows:
+        for window in windows:
+            if window.get('kCGWindowNumber', 0) == window_id:
+                return window
+
+    # Consulta individual vazia: procura na lista completa
+    for window in _get_all_windows_info(on_screen_only=False, max_age=_WINDOW_STATE_TTL):
+        if window.get('kCGWindowNumber', 0) == window_id:
+            return window
+    return None
 
 
 def is_window_minimized(window_id: int) -> bool:
@@ -97,17 +439,13 @@ def is_window_minimized(window_id: int) -> bool:
         True se a janela esta minimizada
     """
     try:
-        # Busca todas as janelas (incluindo minimizadas)
-        all_windows = _get_all_windows_info(on_screen_only=False)
-        on_screen_windows = _get_all_windows_info(on_screen_only=True)
+        # Se esta na tela, nao esta minimizada
+        if window_id in _get_visible_window_ids():
+            return False
 
-        all_ids = {w.get('kCGWindowNumber', 0) for w in all_windows}
-        on_screen_ids = {w.get('kCGWindowNumber', 0) for w in on_screen_windows}
-
-        # Se existe em all mas nao em on_screen, esta minimizada
-        if window_id in all_ids and window_id not in on_screen_ids:
-            return True
-        return False
+        # Se existe entre todas as janelas mas nao na tela, esta minimizada
+        all_windows = _get_all_windows_info(on_screen_only=False, max_age=_WINDOW_STATE_TTL)
+        return any(w.get('kCGWindowNumber', 0) == window_id for w in all_windows)
     except Exception:
         return False
 
@@ -122,51 +460,66 @@ def get_windows(include_minimized: bool = True) -> List[Tuple[int, str]]:
     Returns:
         Lista de tuplas (window_id, titulo) ordenadas por titulo
     """
+    # A lista completa pode durar mais quando as notificacoes a mantem em dia;
+    # o filtro "na tela" depende de minimizar, que nao gera notificacao
+    if include_minimized and _window_notifications_seen:
+        max_age = _WINDOW_LIST_TTL
+    else:
+        max_age = _WINDOW_STATE_TTL
+    return [(entry.window_id, entry.display_title) for entry in _list_windows(include_minimized, max_age)]
+
+
+def _list_windows(include_minimized: bool = True, max_age: float = _WINDOW_STATE_TTL) -> List[_WindowEntry]:
+    """
+    Lista as janelas com titulo valido, ordenadas por titulo, e atualiza os caches.
+
+    O resultado e reaproveitado enquanto a lista do Quartz em cache for a mesma,
+    entao buscas repetidas por titulo nao refazem o filtro nem a ordenacao.
+
+    Args:
+        include_minimized: Se True, inclui janelas minimizadas
+        max_age: Idade maxima da lista do Quartz reaproveitada, em segundos
+
+    Returns:
+        Lista de entradas sem duplicatas (compartilhada, nao deve ser modificada)
+    """
     global _window_cache
     windows = []
-    _window_cache.clear()
+    seen = set()
 
     try:
-        # Pega janelas na tela
-        on_screen = _get_all_windows_info(on_screen_only=True)
-
-        if include_minimized:
-            # Tambem pega todas para incluir minimizadas
-            all_windows = _get_all_windows_info(on_screen_only=False)
-            on_screen_ids = {w.get('kCGWindowNumber', 0) for w in on_screen}
-
-            # Combina: on_screen + minimizadas (que existem mas nao estao on_screen)
-            combined = list(on_screen)
-            for w in all_windows:
-                wid = w.get('kCGWindowNumber', 0)
-                if wid not in on_screen_ids:
-                    combined.append(w)
-            window_list = combined
-        else:
-            window_list = on_screen
-
-        for window in window_list:
-            window_id = window.get('kCGWindowNumber', 0)
-            title = window.get('kCGWindowName', '') or ''
-            owner = window.get('kCGWindowOwnerName', '') or ''
+        # Uma unica consulta: todas as janelas (on screen + minimizadas)
+        # e o filtro de "na tela" e aplicado no proprio loop
+        entries = _get_window_entries(on_screen_only=False, max_age=max_age)
+        cached = _sorted_windows_cache.get(include_minimized)
+        if cached and cached[0] is entries:
+            return cached[1]
+
+        _window_cache.clear()
+        _title_cache.clear()
+
+        for entry in entries:
+            if not include_minimized and not entry.on_screen:
+                continue
+
+            window_id = entry.window_id
+            # Remove duplicatas mantendo primeira ocorrencia
+            if window_id in seen:
+                continue
 
             # Filtra janelas sem titulo ou muito curto
             # Usa owner name se title estiver vazio
-            display_title = title if title else owner
+            display_title = entry.display_title
             if display_title and len(display_title) > 2:
                 # Cache para lookup rapido
-                _window_cache[window_id] = window
-                windows.append((window_id, display_title))
-
-        # Remove duplicatas mantendo primeira ocorrencia
-        seen = set()
-        unique_windows = []
-        for wid, title in windows:
-            if wid not in seen:
-                seen.add(wid)
-                unique_windows.append((wid, title))
+                _window_cache[window_id] = entry.info
+                _title_cache[window_id] = display_title
+                seen.add(window_id)
+                windows.append(entry)
 
-        return sorted(unique_windows, key=lambda x: x[1].lower())
+        windows.sort(key=lambda entry: entry.display_lower)
+        _sorted_windows_cache[include_minimized] = (entries, windows)
+        return windows
 
     except Exception as e:
         print(f"Erro ao listar janelas: {e}")
@@ -184,7 +537,12 @@ def get_window_title(window_id: int) -> str:
         Titulo da janela ou string vazia se falhar
     """
     try:
-        # Tenta do cache primeiro
+        # Tenta do indice de titulos primeiro
+        title = _title_cache.get(window_id)
+        if title is not None:
+            return title
+
+        # Depois do cache de janelas
         if window_id in _window_cache:
             window = _window_cache[window_id]
             title = window.get('kCGWindowName', '') or ''
@@ -193,19 +551,18 @@ def get_window_title(window_id: int) -> str:
             return title
 
         # Busca na lista de janelas
-        windows = _get_all_windows_info(on_screen_only=False)
-        for window in windows:
-            if window.get('kCGWindowNumber', 0) == window_id:
-                title = window.get('kCGWindowName', '') or ''
-                if not title:
-                    title = window.get('kCGWindowOwnerName', '') or ''
-                return title
-        return ""
+        window = _find_window_info(window_id)
+        if window is None:
+            return ""
+        title = window.get('kCGWindowName', '') or ''
+        if not title:
+            title = window.get('kCGWindowOwnerName', '') or ''
+        return title
     except Exception:
         return ""
 
 
-def get_window_dpi_scale(window_id: int) -> float:
+def get_window_dpi_scale(window_id: int, rect: Optional[Tuple[int, int, int, int]] = None) -> float:
     """
     Detecta a escala DPI da tela onde a janela esta.
 
@@ -213,34 +570,31 @@ def get_window_dpi_scale(window_id: int) -> float:
 
     Args:
         window_id: ID da janela
+        rect: Rect da janela ja obtido pelo chamador. Se None, consulta
 
     Returns:
         Escala DPI: 1.0 (normal) ou 2.0 (Retina)
     """
     try:
+        _expire_screen_cache()
+        screens, main_scale = _get_screen_frames()
+
         # Obtem bounds da janela
-        bounds = get_window_rect(window_id)
+        bounds = rect if rect is not None else get_window_rect(window_id)
         if not bounds:
-            return NSScreen.mainScreen().backingScaleFactor()
+            return main_scale
 
         window_x = bounds[0]
         window_y = bounds[1]
 
         # Encontra qual tela contem a janela
-        for screen in NSScreen.screens():
-            frame = screen.frame()
-            # Converte coordenadas
-            screen_x = int(frame.origin.x)
-            screen_y = _convert_y_coordinate(frame.origin.y, frame.size.height)
-            screen_w = int(frame.size.width)
-            screen_h = int(frame.size.height)
-
+        for screen_x, screen_y, screen_w, screen_h, scale in screens:
             if (screen_x <= window_x < screen_x + screen_w and
                 screen_y <= window_y < screen_y + screen_h):
-                return screen.backingScaleFactor()
+                return scale
 
         # Fallback: usa tela principal
-        return NSScreen.mainScreen().backingScaleFactor()
+        return main_scale
 
     except Exception:
         return 1.0
@@ -263,8 +617,12 @@ def find_window_by_title(pattern: str, include_minimized: bool = False) -> Optio
     Returns:
         window_id da janela ou None se nao encontrada
     """
-    windows = find_all_windows_by_title(pattern, include_minimized=include_minimized)
-    return windows[0] if windows else None
+    # Mesma ordem de find_all_windows_by_title, mas para no primeiro match
+    matches = _compile_title_matcher(pattern)
+    for entry in _list_windows(include_minimized=include_minimized):
+        if matches(entry.display_lower):
+            return entry.window_id
+    return None
 
 
 def find_all_windows_by_title(pattern: str, include_minimized: bool = False) -> List[int]:
@@ -286,33 +644,50 @@ def find_all_windows_by_title(pattern: str, include_minimized: bool = False) ->
     Returns:
         Lista de window_ids das janelas encontradas
     """
-    pattern_lower = pattern.lower().replace("*", "")
-    matching = []
+    matches = _compile_title_matcher(pattern)
+    return [
+        entry.window_id
+        for entry in _list_windows(include_minimized=include_minimized)
+        if matches(entry.display_lower)
+    ]
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_title_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Classifica o padrao uma unica vez e retorna o predicado correspondente.
 
-    for window_id, title in get_windows(include_minimized=include_minimized):
-        title_lower = title.lower()
-        matched = False
+    O predicado fica em cache por padrao: tasks repetidas buscam sempre
+    o mesmo titulo e nao recompilam o regex a cada tick.
 
-        if pattern.startswith("*") and pattern.endswith("*"):
-            # *pattern* - contem
-            matched = pattern_lower in title_lower
-        elif pattern.startswith("*"):
-            # *pattern - termina com
-            matched = title_lower.endswith(pattern_lower)
-        elif pattern.endswith("*"):
-            # pattern* - comeca com
-            matched = title_lower.startswith(pattern_lower)
-        elif title_lower == pattern.lower():
-            # Match exato
-            matched = True
-        elif pattern.lower() in title_lower or title_lower in pattern.lower():
-            # Match parcial (para titulos truncados)
-            matched = True
+    Args:
+        pattern: Padrao de busca com wildcards opcionais
+
+    Returns:
+        Funcao que recebe o titulo em minusculas e retorna True se corresponde
+    """
+    pattern_lower = pattern.lower()
 
-        if matched:
-            matching.append(window_id)
+    if "*" not in pattern:
+        # Match exato ou parcial (para titulos truncados)
+        return lambda title_lower: pattern_lower in title_lower or title_lower in pattern_lower
 
-    return matching
+    # Casos comuns ("Chrome*", "*YouTube*", "*Notepad") viram uma unica
+    # operacao de string, sem passar pelo regex
+    literal = pattern_lower.strip("*")
+    if "*" not in literal:
+        if pattern_lower.startswith("*") and pattern_lower.endswith("*"):
+            return lambda title_lower: literal in title_lower
+        if pattern_lower.endswith("*"):
+            return lambda title_lower: title_lower.startswith(literal)
+        return lambda title_lower: title_lower.endswith(literal)
+
+    # Wildcards: "*" vira ".*" e o resto e literal (colchetes e "?" sao comuns
+    # em titulos, por isso nao usamos fnmatch.translate). O regex compilado
+    # cobre os demais padroes, como "*" no meio ("Safari*- Preview")
+    regex = re.compile(".*".join(re.escape(part) for part in pattern_lower.split("*")), re.DOTALL)
+    fullmatch = regex.fullmatch
+    return lambda title_lower: fullmatch(title_lower) is not None
 
 
 def get_windows_by_process(
@@ -335,25 +710,17 @@ def get_windows_by_process(
     process_lower = process_name.lower()
 
     try:
-        if include_minimized:
-            windows = _get_all_windows_info(on_screen_only=False, include_all_spaces=True)
-        else:
-            # Inclui todos os Spaces para suportar janelas fullscreen
-            windows = _get_all_windows_info(on_screen_only=True, include_all_spaces=True)
-
-        for window in windows:
-            owner = window.get('kCGWindowOwnerName', '') or ''
-            title = window.get('kCGWindowName', '') or ''
-            window_id = window.get('kCGWindowNumber', 0)
+        # Inclui todos os Spaces para suportar janelas fullscreen
+        entries = _get_window_entries(on_screen_only=not include_minimized, include_all_spaces=True)
+        filter_lower = title_filter.lower() if title_filter is not None else None
 
+        for entry in entries:
             # Verifica se o processo corresponde
-            if process_lower in owner.lower():
-                display_title = title if title else owner
-
-                if len(display_title) > 2:
+            if process_lower in entry.owner_lower:
+                if len(entry.display_title) > 2:
                     # Aplica filtro de titulo se especificado
-                    if title_filter is None or title_filter.lower() in display_title.lower():
-                        matching.append((window_id, display_title, owner))
+                    if filter_lower is None or filter_lower in entry.display_lower:
+                        matching.append((entry.window_id, entry.display_title, entry.owner))
 
         # Remove duplicatas
         seen = set()
@@ -426,18 +793,13 @@ def get_available_processes() -> List[str]:
     processes = set()
 
     try:
-        windows = _get_all_windows_info(on_screen_only=True)
-
-        for window in windows:
-            owner = window.get('kCGWindowOwnerName', '') or ''
-            title = window.get('kCGWindowName', '') or ''
-
-            # Filtra janelas sem titulo significativo
-            display_title = title if title else owner
-            if owner and len(display_title) > 2:
+        for entry in _get_window_entries(on_screen_only=True):
+            owner = entry.owner
+            # Filtra janelas sem titulo significativo (pula owners ja vistos)
+            if owner and owner not in processes and len(entry.display_title) > 2:
                 processes.add(owner)
 
-        return sorted(list(processes))
+        return sorted(processes)
 
     except Exception as e:
         print(f"Erro ao listar processos: {e}")
@@ -456,16 +818,8 @@ def get_window_rect(window_id: int) -> Optional[Tuple[int, int, int, int]]:
         Coordenadas convertidas para sistema top-left origin
     """
     try:
-        # Tenta do cache primeiro
-        window = _window_cache.get(window_id)
-
-        if not window:
-            # Busca na lista de janelas
-            windows = _get_all_windows_info(on_screen_only=False)
-            for w in windows:
-                if w.get('kCGWindowNumber', 0) == window_id:
-                    window = w
-                    break
+        # Nao usa _window_cache: a posicao muda sem notificacao
+        window = _find_window_info(window_id)
 
         if not window:
             return None
@@ -502,13 +856,29 @@ def is_window_visible(window_id: int) -> bool:
     """
     try:
         # Inclui janelas de todos os Spaces para suportar fullscreen
-        all_windows = _get_all_windows_info(on_screen_only=True, include_all_spaces=True)
-        visible_ids = {w.get('kCGWindowNumber', 0) for w in all_windows}
-        return window_id in visible_ids
+        return window_id in _get_visible_window_ids()
     except Exception:
         return False
 
 
+def _get_visible_window_ids() -> frozenset:
+    """
+    Retorna os IDs das janelas visiveis (todos os Spaces).
+
+    O conjunto e montado uma vez por lista em cache e compartilhado entre
+    as chamadas, em vez de ser reconstruido a cada verificacao.
+    """
+    windows = _get_all_windows_info(on_screen_only=True, include_all_spaces=True,
+                                    max_age=_WINDOW_STATE_TTL)
+    cached = _window_entries_cache.get('visible_ids')
+    if cached and cached[0] is windows:
+        return cached[1]
+
+    visible_ids = frozenset(w.get('kCGWindowNumber', 0) for w in windows)
+    _window_entries_cache['visible_ids'] = (windows, visible_ids)
+    return visible_ids
+
+
 def get_window_at_point(x: int, y: int) -> Optional[int]:
     """
     Encontra a janela na posicao especificada.
@@ -521,27 +891,11 @@ def get_window_at_point(x: int, y: int) -> Optional[int]:
         window_id da janela na posicao ou None
     """
     try:
-        windows = _get_all_windows_info(on_screen_only=True)
-
-        # Ordena por layer (janelas mais na frente primeiro)
-        # kCGWindowLayer: menor = mais na frente
-        windows_sorted = sorted(windows, key=lambda w: w.get('kCGWindowLayer', 0))
-
-        for window in windows_sorted:
-            bounds = window.get('kCGWindowBounds', {})
-            wx = int(bounds.get('X', 0))
-            wy = int(bounds.get('Y', 0))
-            ww = int(bounds.get('Width', 0))
-            wh = int(bounds.get('Height', 0))
-
-            if wx <= x < wx + ww and wy <= y < wy + wh:
-                window_id = window.get('kCGWindowNumber', 0)
-                # Ignora janelas do sistema (Dock, Menu Bar, etc)
-                owner = window.get('kCGWindowOwnerName', '')
-                if owner not in ['Window Server', 'Dock', 'SystemUIServer']:
-                    return window_id
-
-        return None
+        windows = _get_all_windows_info(on_screen_only=True, max_age=_WINDOW_STATE_TTL)
+        index = _window_index_at_point(windows, x, y)
+        if index is None:
+            return None
+        return windows[index].get('kCGWindowNumber', 0)
 
     except Exception as e:
         print(f"Erro ao buscar janela na posicao: {e}")
@@ -560,25 +914,11 @@ def get_process_at_point(x: int, y: int) -> str:
         Nome do app ou string vazia
     """
     try:
-        windows = _get_all_windows_info(on_screen_only=True)
-
-        # Ordena por layer
-        windows_sorted = sorted(windows, key=lambda w: w.get('kCGWindowLayer', 0))
-
-        for window in windows_sorted:
-            bounds = window.get('kCGWindowBounds', {})
-            wx = int(bounds.get('X', 0))
-            wy = int(bounds.get('Y', 0))
-            ww = int(bounds.get('Width', 0))
-            wh = int(bounds.get('Height', 0))
-
-            if wx <= x < wx + ww and wy <= y < wy + wh:
-                owner = window.get('kCGWindowOwnerName', '')
-                # Ignora janelas do sistema
-                if owner not in ['Window Server', 'Dock', 'SystemUIServer']:
-                    return owner
-
-        return ''
+        windows = _get_all_windows_info(on_screen_only=True, max_age=_WINDOW_STATE_TTL)
+        index = _window_index_at_point(windows, x, y)
+        if index is None:
+            return ''
+        return windows[index].get('kCGWindowOwnerName', '')
 
     except Exception:
         return ''
@@ -26,8 +26,13 @@ import time
 import sys
 import os
 import json
+import logging
+import logging.handlers
+import queue
+import signal
+from collections import defaultdict
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 import threading
 
 # Importa funcoes do core (macOS)
@@ -36,14 +41,23 @@ try:
         get_windows, find_window_by_title, get_window_dpi_scale,
         get_window_rect, is_window_visible
     )
-    from core.image_matcher import find_and_click, capture_window
+    from core.image_matcher import (
+        find_and_click, capture_window_gray, prepare_template, match_template, TEMPLATE_NOT_FOUND
+    )
     import cv2
+    import mss
     import numpy as np
     HAS_QUARTZ = True
 except ImportError as e:
     HAS_QUARTZ = False
     print(f"Aviso: Modo janela especifica desativado. {e}")
 
+# Parser JSON mais rapido (opcional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuracoes
 BASE_DIR = Path(__file__).parent
 IMAGES_DIR = BASE_DIR / "images"
@@ -52,11 +66,21 @@ TASKS_FILE = BASE_DIR / "tasks.json"
 CONFIDENCE = 0.9  # 90% de precisao no reconhecimento
 TIMEOUT = 30  # Segundos para esperar uma imagem
 
-# Seguranca: pause antes de cada acao
-pyautogui.PAUSE = 0.5
+# Pausa curta apos cada chamada do pyautogui (0.5s somava meio segundo por
+# tecla/clique). Onde a UI precisa reagir, a espera e explicita (CLICK_SETTLE)
+pyautogui.PAUSE = 0.02
+CLICK_SETTLE = 0.2  # Segundos para a UI reagir a um clique (menus, foco)
 pyautogui.FAILSAFE = True  # Mova o mouse para o canto superior esquerdo para parar
 
 
+def load_json(path: Path):
+    """Le um arquivo JSON (usa orjson se estiver instalado)"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def ensure_dirs():
     """Garante que os diretorios existam"""
     IMAGES_DIR.mkdir(exist_ok=True)
@@ -65,29 +89,71 @@ def ensure_dirs():
 
 # ============== Window-specific functions (macOS) ==============
 
-def find_and_click_window(window_id: int, template_path: Path, action: str = "click"):
+def find_and_click_window(window_id: int, template_path: Path, action: str = "click", screenshot_gray=None):
     """
     Encontra template em janela especifica e clica (usando Quartz/OpenCV).
+    screenshot_gray: captura ja feita da janela (opcional, evita recapturar)
     Retorna: (sucesso, mensagem, match_percentage)
     """
     if not HAS_QUARTZ:
         return False, "Quartz nao disponivel", 0.0
 
-    try:
-        return find_and_click(window_id, template_path, action)
-    except Exception as e:
-        return False, str(e), 0.0
+    # find_and_click nunca levanta excecao: falhas voltam na mensagem
+    return find_and_click(window_id, template_path, action, screenshot_gray=screenshot_gray)
 
 
 # ============== Original pyautogui functions ==============
 
+def _select_region_interactive(image_path: Path):
+    """
+    Seleciona a regiao arrastando o mouse, com o mesmo overlay de captura
+    da GUI, e salva em image_path.
+
+    Returns:
+        True se salvou, False se cancelado (ESC) ou None se o PyQt6
+        nao estiver disponivel
+    """
+    try:
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtWidgets import QApplication
+        from ui_qt.components.capture_overlay import CaptureOverlay
+    except ImportError:
+        return None
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    saved = []
+
+    overlay = CaptureOverlay(
+        save_dir=IMAGES_DIR,
+        on_complete=saved.append,
+        fixed_output_path=image_path
+    )
+    overlay.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+    overlay.destroyed.connect(app.quit)  # Overlay e janela Tool: nao encerra sozinho
+    overlay.start()
+    app.exec()
+
+    return bool(saved)
+
+
 def capture_region(name: str):
     """
     Captura uma regiao da tela para usar como referencia de clique.
-    Apos executar, voce tem 3 segundos para posicionar o mouse no canto superior esquerdo
-    da regiao, depois mais 3 segundos para o canto inferior direito.
+    Com PyQt6, a regiao e selecionada arrastando o mouse sobre a tela.
+    Sem ele, voce tem 3 segundos para posicionar o mouse no canto superior
+    esquerdo da regiao, depois mais 3 segundos para o canto inferior direito.
     """
     print(f"Capturando regiao: {name}")
+    image_path = IMAGES_DIR / f"{name}.png"
+
+    selected = _select_region_interactive(image_path)
+    if selected is not None:
+        if selected:
+            print(f"   Imagem salva: {image_path}")
+        else:
+            print("   Captura cancelada")
+        return
+
     print("   Posicione o mouse no CANTO SUPERIOR ESQUERDO da regiao...")
     print("   Aguardando 3 segundos...")
     time.sleep(3)
@@ -113,13 +179,127 @@ def capture_region(name: str):
         return
 
     screenshot = pyautogui.screenshot(region=(x, y, width, height))
-    image_path = IMAGES_DIR / f"{name}.png"
     screenshot.save(image_path)
 
     print(f"   Imagem salva: {image_path}")
     print(f"   Dimensoes: {width}x{height}")
 
 
+# Templates ja preparados: caminho -> (mtime_ns, PreparedTemplate)
+_template_cache = {}
+
+
+def get_template(path: Path):
+    """
+    Retorna o template preparado (cinza + piramide), decodificando o PNG
+    so se o arquivo mudar. Retorna None se a imagem nao puder ser lida.
+    """
+    mtime = path.stat().st_mtime_ns
+    cached = _template_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    template = prepare_template(gray) if gray is not None else None
+    _template_cache[path] = (mtime, template)
+    return template
+
+
+# Instancia do mss e buffer da tela em cinza, reaproveitados entre buscas
+# (um por thread: instancias do mss nao devem ser compartilhadas)
+_screen_local = threading.local()
+
+
+def _grab_screen_gray():
+    """Captura todas as telas direto em cinza. Retorna (imagem, monitor)"""
+    sct = getattr(_screen_local, 'sct', None)
+    if sct is None:
+        sct = mss.mss()
+        _screen_local.sct = sct
+
+    monitor = sct.monitors[0]  # Todas as telas
+    raw = np.asarray(sct.grab(monitor))  # BGRA, sem copia
+
+    gray = getattr(_screen_local, 'gray', None)
+    if gray is None or gray.shape != raw.shape[:2]:
+        gray = np.empty(raw.shape[:2], np.uint8)
+        _screen_local.gray = gray
+    return cv2.cvtColor(raw, cv2.COLOR_BGRA2GRAY, dst=gray), monitor
+
+
+def _match_on_screen(screen, monitor, template):
+    """
+    Procura o template numa captura em cinza de `monitor` e converte o
+    resultado para pontos logicos.
+
+    Returns:
+        Tupla (left, top, width, height) ou None se nao encontrado
+    """
+    h, w = template.template.shape
+    if h > screen.shape[0] or w > screen.shape[1]:
+        return None
+
+    # Piramide: passada grossa em resolucao reduzida e refino local
+    max_val, (x, y) = match_template(screen, template)
+    if max_val < CONFIDENCE:
+        return None
+
+    # mss retorna pixels fisicos (2x em Retina); pyautogui usa pontos
+    scale = screen.shape[1] / monitor["width"]
+    return (
+        monitor["left"] + int(x / scale),
+        monitor["top"] + int(y / scale),
+        int(w / scale),
+        int(h / scale),
+    )
+
+
+def _locate_on_screen(template):
+    """
+    Localiza o template na tela inteira usando mss + OpenCV.
+
+    Bem mais rapido que pyautogui.locateOnScreen (que monta uma imagem PIL
+    da tela a cada busca) e converte o resultado para pontos logicos.
+
+    Returns:
+        Tupla (left, top, width, height) ou None se nao encontrado
+    """
+    screen, monitor = _grab_screen_gray()
+    return _match_on_screen(screen, monitor, template)
+
+
+# Ultima posicao encontrada por imagem: nome -> (timestamp, location)
+_last_match = {}
+LAST_MATCH_TTL = 1.0  # Segundos em que a posicao anterior e tentada primeiro
+LAST_MATCH_MARGIN = 32  # Pontos ao redor da posicao anterior
+
+
+def _locate_near(template, location):
+    """
+    Procura o template so numa regiao pequena ao redor de uma posicao
+    anterior (mesmo botao clicado de novo logo em seguida).
+
+    Returns:
+        Tupla (left, top, width, height) ou None se nao estiver mais la
+    """
+    sct = getattr(_screen_local, 'sct', None)
+    if sct is None:
+        return None
+
+    screen = sct.monitors[0]
+    left, top, width, height = location
+    x1 = max(left - LAST_MATCH_MARGIN, screen["left"])
+    y1 = max(top - LAST_MATCH_MARGIN, screen["top"])
+    x2 = min(left + width + LAST_MATCH_MARGIN, screen["left"] + screen["width"])
+    y2 = min(top + height + LAST_MATCH_MARGIN, screen["top"] + screen["height"])
+    if x2 <= x1 or y2 <= y1:
+        return None
+
+    region = {"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1}
+    raw = np.asarray(sct.grab(region))
+    return _match_on_screen(cv2.cvtColor(raw, cv2.COLOR_BGRA2GRAY), region, template)
+
+
 def find_image(name: str, timeout: float = 0):
     """Encontra uma imagem na tela"""
     image_path = IMAGES_DIR / f"{name}.png"
@@ -128,19 +308,42 @@ def find_image(name: str, timeout: float = 0):
         print(f"   Imagem nao encontrada: {image_path}")
         return None
 
+    # Template em cache entre chamadas
+    template = get_template(image_path) if HAS_QUARTZ else None
+
+    # Encontrada ha pouco: confere primeiro so ao redor da posicao anterior
+    if template is not None:
+        last = _last_match.get(name)
+        if last and time.time() - last[0] < LAST_MATCH_TTL:
+            location = _locate_near(template, last[1])
+            if location:
+                _last_match[name] = (time.time(), location)
+                return location
+
+    # Backoff: comeca com polling rapido (imagem que aparece logo e
+    # detectada cedo) e espaca ate 0.5s em esperas longas
+    delay = 0.05
     start_time = time.time()
     while True:
-        try:
-            location = pyautogui.locateOnScreen(str(image_path), confidence=CONFIDENCE)
+        if template is not None:
+            location = _locate_on_screen(template)
             if location:
+                _last_match[name] = (time.time(), location)
                 return location
-        except pyautogui.ImageNotFoundException:
-            pass
-
-        if timeout <= 0 or (time.time() - start_time) >= timeout:
+        else:
+            try:
+                location = pyautogui.locateOnScreen(str(image_path), confidence=CONFIDENCE)
+                if location:
+                    return location
+            except pyautogui.ImageNotFoundException:
+                pass
+
+        elapsed = time.time() - start_time
+        if timeout <= 0 or elapsed >= timeout:
             break
 
-        time.sleep(0.5)
+        time.sleep(min(delay, timeout - elapsed))
+        delay = min(delay * 1.5, 0.5)
 
     return None
 
@@ -156,6 +359,7 @@ def click_image(name: str, wait: bool = False):
         center = pyautogui.center(location)
         print(f"   Encontrado em: ({center.x}, {center.y})")
         pyautogui.click(center)
+        time.sleep(CLICK_SETTLE)
         print(f"   Clique realizado!")
         return True
     else:
@@ -173,6 +377,7 @@ def double_click_image(name: str, wait: bool = False):
     if location:
         center = pyautogui.center(location)
         pyautogui.doubleClick(center)
+        time.sleep(CLICK_SETTLE)
         print(f"   Duplo clique realizado!")
         return True
     return False
@@ -188,6 +393,7 @@ def right_click_image(name: str, wait: bool = False):
     if location:
         center = pyautogui.center(location)
         pyautogui.rightClick(center)
+        time.sleep(CLICK_SETTLE)
         print(f"   Clique direito realizado!")
         return True
     return False
@@ -218,6 +424,66 @@ def wait_seconds(seconds: float):
     time.sleep(seconds)
 
 
+# Acoes de script: cada uma retorna False para abortar o script
+def _do_click(action):
+    if not click_image(action['image'], action.get('wait', False)):
+        if action.get('required', True):
+            print("   Acao obrigatoria falhou! Abortando...")
+            return False
+    return True
+
+
+def _do_double_click(action):
+    double_click_image(action['image'], action.get('wait', False))
+    return True
+
+
+def _do_right_click(action):
+    right_click_image(action['image'], action.get('wait', False))
+    return True
+
+
+def _do_type(action):
+    type_text(action['text'], action.get('interval', 0.05))
+    return True
+
+
+def _do_press(action):
+    press_key(action['key'])
+    return True
+
+
+def _do_hotkey(action):
+    hotkey(*action['keys'])
+    return True
+
+
+def _do_wait(action):
+    wait_seconds(action['seconds'])
+    return True
+
+
+def _do_wait_for(action):
+    print(f"   Esperando imagem: {action['image']}")
+    if not find_image(action['image'], action.get('timeout', TIMEOUT)):
+        print(f"   Timeout esperando: {action['image']}")
+        return False
+    print(f"   Imagem encontrada!")
+    return True
+
+
+SCRIPT_ACTIONS = {
+    'click': _do_click,
+    'double_click': _do_double_click,
+    'right_click': _do_right_click,
+    'type': _do_type,
+    'press': _do_press,
+    'hotkey': _do_hotkey,
+    'wait': _do_wait,
+    'wait_for': _do_wait_for,
+}
+
+
 def run_script(script_name: str):
     """
     Executa um script de automacao (arquivo JSON com sequencia de acoes)
@@ -230,51 +496,30 @@ def run_script(script_name: str):
         create_example_script()
         return
 
-    with open(script_path, 'r', encoding='utf-8') as f:
-        script = json.load(f)
+    script = load_json(script_path)
+    actions = script.get('actions', [])
+    n = len(actions)
 
     print(f"Executando script: {script_name}")
     print(f"   Descricao: {script.get('description', 'Sem descricao')}")
-    print(f"   Acoes: {len(script.get('actions', []))}")
+    print(f"   Acoes: {n}")
     print("-" * 50)
 
-    for i, action in enumerate(script.get('actions', []), 1):
-        action_type = action.get('type')
-        print(f"\n[{i}/{len(script['actions'])}] {action_type}")
-
-        if action_type == 'click':
-            if not click_image(action['image'], action.get('wait', False)):
-                if action.get('required', True):
-                    print("   Acao obrigatoria falhou! Abortando...")
-                    return False
+    # Pausa opcional entre acoes (o pyautogui.PAUSE global e minimo)
+    pause_between = script.get('pause_between', 0)
 
-        elif action_type == 'double_click':
-            double_click_image(action['image'], action.get('wait', False))
+    for i, action in enumerate(actions, 1):
+        if pause_between and i > 1:
+            time.sleep(pause_between)
 
-        elif action_type == 'right_click':
-            right_click_image(action['image'], action.get('wait', False))
-
-        elif action_type == 'type':
-            type_text(action['text'], action.get('interval', 0.05))
-
-        elif action_type == 'press':
-            press_key(action['key'])
-
-        elif action_type == 'hotkey':
-            hotkey(*action['keys'])
-
-        elif action_type == 'wait':
-            wait_seconds(action['seconds'])
-
-        elif action_type == 'wait_for':
-            print(f"   Esperando imagem: {action['image']}")
-            if not find_image(action['image'], action.get('timeout', TIMEOUT)):
-                print(f"   Timeout esperando: {action['image']}")
-                return False
-            print(f"   Imagem encontrada!")
+        action_type = action.get('type')
+        print(f"\n[{i}/{n}] {action_type}")
 
-        else:
+        handler = SCRIPT_ACTIONS.get(action_type)
+        if handler is None:
             print(f"   Tipo de acao desconhecido: {action_type}")
+        elif not handler(action):
+            return False
 
     print("\n" + "=" * 50)
     print("Script executado com sucesso!")
@@ -318,15 +563,19 @@ def create_example_script():
 def list_images():
     """Lista todas as imagens capturadas"""
     print("Imagens disponiveis:")
-    for img in IMAGES_DIR.glob("*.png"):
-        print(f"   - {img.stem}")
+    with os.scandir(IMAGES_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".png") and entry.is_file():
+                print(f"   - {entry.name[:-4]}")
 
 
 def list_scripts():
     """Lista todos os scripts disponiveis"""
     print("Scripts disponiveis:")
-    for script in SCRIPTS_DIR.glob("*.json"):
-        print(f"   - {script.stem}")
+    with os.scandir(SCRIPTS_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                print(f"   - {entry.name[:-5]}")
 
 
 def list_tasks():
@@ -335,8 +584,7 @@ def list_tasks():
         print("Nenhuma task configurada (tasks.json nao existe)")
         return
 
-    with open(TASKS_FILE, 'r', encoding='utf-8') as f:
-        tasks = json.load(f)
+    tasks = load_json(TASKS_FILE)
 
     print(f"Tasks configuradas ({len(tasks)}):")
     for task in tasks:
@@ -356,8 +604,7 @@ def run_tasks():
         print("   Use a GUI para criar tasks ou crie manualmente.")
         return
 
-    with open(TASKS_FILE, 'r', encoding='utf-8') as f:
-        tasks = json.load(f)
+    tasks = load_json(TASKS_FILE)
 
     enabled_tasks = [t for t in tasks if t.get('enabled', True)]
 
@@ -371,18 +618,57 @@ def run_tasks():
 
     stop_event = threading.Event()
 
-    def run_single_task(task):
-        task_id = task['id']
-        window_title = task.get('window_title', '')
-        process = task.get('process', '')
-        image_name = task['image_name']
-        action = task.get('action', 'click')
-        repeat = task.get('repeat', False)
-        interval = task.get('interval', 5.0)
-
-        template_path = IMAGES_DIR / f"{image_name}.png"
+    # As threads das tasks apenas enfileiram as mensagens; uma unica thread
+    # escreve no stdout, sem as tasks disputarem o terminal a cada linha
+    log_queue = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, output)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger = logging.getLogger("iclick.tasks")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    log = logger.info
+
+    # Tasks na mesma janela sao executadas juntas: a janela e resolvida
+    # e capturada uma vez por rodada para todos os templates do grupo
+    groups = defaultdict(list)
+    for task in enabled_tasks:
+        groups[(task.get('window_title', ''), task.get('process', ''))].append(task)
+
+    # Cada grupo ja roda em sua propria thread: divide os nucleos entre os
+    # grupos para o matchTemplate paralelo do OpenCV nao disputar a CPU
+    if len(groups) > 1:
+        cv2.setNumThreads(max(1, (os.cpu_count() or 1) // len(groups)))
+
+    def run_task_group(window_title, process, group):
+        next_run = {task['id']: 0.0 for task in group}
+        pending = list(group)
+
+        # Caminhos resolvidos uma vez; a existencia do arquivo so e verificada
+        # ate o primeiro sucesso, ou de novo se o matcher nao achar o template
+        template_paths = {task['id']: IMAGES_DIR / f"{task['image_name']}.png" for task in group}
+        known_templates = set()
+
+        def finish(task):
+            pending.remove(task)
+            log(f"   [#{task['id']}] Parado")
+
+        def retry_later(task, delay):
+            if task.get('repeat', False):
+                next_run[task['id']] = time.monotonic() + delay
+            else:
+                finish(task)
+
+        while pending and not stop_event.is_set():
+            now = time.monotonic()
+            due = [task for task in pending if next_run[task['id']] <= now]
+            if not due:
+                # Dorme ate a proxima task do grupo vencer
+                stop_event.wait(min(next_run[task['id']] for task in pending) - now)
+                continue
 
-        while not stop_event.is_set():
             # Encontra janela
             window_id = None
             if window_title:
@@ -393,50 +679,78 @@ def run_tasks():
 
             if not window_id:
                 target = window_title or process
-                print(f"   [#{task_id}] Janela nao encontrada: {target[:30]}")
-                if not repeat:
-                    break
-                time.sleep(2)
+                for task in due:
+                    log(f"   [#{task['id']}] Janela nao encontrada: {target[:30]}")
+                    retry_later(task, 2)
                 continue
 
-            # Executa click
-            if not template_path.exists():
-                print(f"   [#{task_id}] Imagem nao existe: {image_name}")
-                if not repeat:
-                    break
-                time.sleep(2)
-                continue
-
-            success, msg, match = find_and_click_window(window_id, template_path, action)
-
-            if success:
-                print(f"   [#{task_id}] OK {image_name} ({match:.0%})")
-            else:
-                print(f"   [#{task_id}] Nao encontrado {image_name} ({match:.0%})")
-
-            if not repeat:
-                break
+            screenshot_gray = None
+            for task in due:
+                image_name = task['image_name']
+                template_path = template_paths[task['id']]
+
+                if template_path not in known_templates:
+                    if not os.path.isfile(template_path):
+                        log(f"   [#{task['id']}] Imagem nao existe: {image_name}")
+                        retry_later(task, 2)
+                        continue
+                    known_templates.add(template_path)
+
+                # Captura compartilhada pelas tasks do grupo nesta rodada
+                if screenshot_gray is None:
+                    screenshot_gray = capture_window_gray(window_id)
+
+                success, msg, match = find_and_click_window(
+                    window_id, template_path, task.get('action', 'click'), screenshot_gray
+                )
+
+                if not success and msg == TEMPLATE_NOT_FOUND:
+                    # Arquivo removido ou ilegivel: volta a checar na proxima rodada
+                    known_templates.discard(template_path)
+                    if os.path.isfile(template_path):
+                        log(f"   [#{task['id']}] Imagem invalida: {image_name}")
+                    else:
+                        log(f"   [#{task['id']}] Imagem nao existe: {image_name}")
+                    retry_later(task, 2)
+                    continue
 
-            # Aguarda intervalo
-            stop_event.wait(interval)
+                if success:
+                    log(f"   [#{task['id']}] OK {image_name} ({match:.0%})")
+                    # O clique pode mudar a janela: proxima task recaptura
+                    screenshot_gray = None
+                else:
+                    log(f"   [#{task['id']}] Nao encontrado {image_name} ({match:.0%})")
 
-        print(f"   [#{task_id}] Parado")
+                retry_later(task, task.get('interval', 5.0))
 
-    try:
-        with ThreadPoolExecutor(max_workers=len(enabled_tasks)) as executor:
-            futures = [executor.submit(run_single_task, task) for task in enabled_tasks]
+        for task in pending:
+            log(f"   [#{task['id']}] Parado")
 
-            # Aguarda ate Ctrl+C
-            while not stop_event.is_set():
-                time.sleep(0.5)
-                # Verifica se todas terminaram (tasks nao-repeat)
-                if all(f.done() for f in futures):
-                    break
-
-    except KeyboardInterrupt:
+    def request_stop(signum, frame):
         print("\nParando todas as tasks...")
         stop_event.set()
 
+    # Ctrl+C apenas sinaliza as tasks; a thread principal fica bloqueada
+    # ate todas terminarem, sem polling
+    previous_handler = signal.signal(signal.SIGINT, request_stop)
+    listener.start()
+    try:
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                executor.submit(run_task_group, window_title, process, group)
+                for (window_title, process), group in groups.items()
+            ]
+            wait(futures)
+
+            # Rede de seguranca: erro inesperado encerra so o grupo afetado
+            for future in futures:
+                if future.exception() is not None:
+                    log(f"   Erro inesperado: {future.exception()}")
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        listener.stop()  # Escreve o que ainda estiver na fila
+        logger.removeHandler(queue_handler)
+
     print("\nExecucao finalizada!")
 
 
@@ -8,10 +8,18 @@ import threading
 from PyQt6.QtWidgets import (
     QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel
 )
-from PyQt6.QtCore import Qt, QRect, QPoint, QBuffer, QIODevice
+from PyQt6.QtCore import Qt, QRect, QRectF, QPoint, QObject, pyqtSignal
 from PyQt6.QtGui import QPainter, QColor, QPen, QPixmap, QGuiApplication, QImage
+from PyQt6 import sip
 from pathlib import Path
 import numpy as np
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+try:
+    import mss
+except ImportError:  # Sem mss: a captura cai para as estrategias do Qt
+    mss = None
 
 from Quartz import (
     CGWindowListCreateImage,
@@ -32,10 +40,16 @@ from Quartz import (
 )
 from AppKit import NSScreen
 
+from core.window_utils import SYSTEM_WINDOW_OWNERS
+
 # Cache global do EasyOCR reader (carrega apenas uma vez)
 _ocr_reader = None
 _ocr_lock = threading.Lock()
 
+# Maior lado da imagem enviada ao OCR: basta para sugerir o nome do template
+# e o custo do EasyOCR cresce com a area da imagem (capturas Retina sao 2x)
+_OCR_MAX_SIDE = 320
+
 
 def _get_ocr_reader():
     """Retorna o reader OCR em cache (singleton thread-safe)."""
@@ -51,8 +65,11 @@ def _get_ocr_reader():
     return _ocr_reader
 
 
-def get_process_at_point(x: int, y: int, exclude_window_id: int = 0) -> str:
-    """Retorna o nome do processo da janela em uma coordenada especifica.
+def _find_window_at_point(x: int, y: int, exclude_window_id: int = 0):
+    """Retorna o dicionario da janela mais a frente na coordenada.
+
+    Percorre a lista uma unica vez guardando a janela de menor layer que
+    contem o ponto, sem ordenar a lista inteira.
 
     Args:
         x: Coordenada X (pixels)
@@ -60,85 +77,100 @@ def get_process_at_point(x: int, y: int, exclude_window_id: int = 0) -> str:
         exclude_window_id: Window ID a excluir da busca (ex: overlay)
 
     Returns:
-        Nome do app (ex: "Safari") ou string vazia
+        Dicionario da janela ou None
     """
-    try:
-        windows = CGWindowListCopyWindowInfo(
-            kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements,
-            kCGNullWindowID
-        )
-
-        if not windows:
-            return ""
+    windows = CGWindowListCopyWindowInfo(
+        kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements,
+        kCGNullWindowID
+    )
 
-        # Ordena por layer (janelas mais na frente primeiro)
-        windows_sorted = sorted(windows, key=lambda w: w.get('kCGWindowLayer', 0))
+    if not windows:
+        return None
 
-        for window in windows_sorted:
-            window_id = window.get('kCGWindowNumber', 0)
-            if window_id == exclude_window_id:
-                continue
+    # kCGWindowLayer: menor = mais na frente (empate mantem a ordem da lista)
+    best = None
+    best_layer = None
+    for window in windows:
+        window_id = window.get('kCGWindowNumber', 0)
+        if window_id == exclude_window_id:
+            continue
 
-            bounds = window.get('kCGWindowBounds', {})
-            wx = int(bounds.get('X', 0))
-            wy = int(bounds.get('Y', 0))
-            ww = int(bounds.get('Width', 0))
-            wh = int(bounds.get('Height', 0))
+        layer = window.get('kCGWindowLayer', 0)
+        if best is not None and layer >= best_layer:
+            continue
 
-            if wx <= x < wx + ww and wy <= y < wy + wh:
-                owner = window.get('kCGWindowOwnerName', '')
-                # Ignora janelas do sistema
-                if owner not in ['Window Server', 'Dock', 'SystemUIServer']:
-                    return owner
+        bounds = window.get('kCGWindowBounds', {})
+        wx = int(bounds.get('X', 0))
+        wy = int(bounds.get('Y', 0))
+        ww = int(bounds.get('Width', 0))
+        wh = int(bounds.get('Height', 0))
 
-        return ""
+        if wx <= x < wx + ww and wy <= y < wy + wh:
+            owner = window.get('kCGWindowOwnerName', '')
+            # Ignora janelas do sistema
+            if owner not in SYSTEM_WINDOW_OWNERS:
+                best = window
+                best_layer = layer
 
-    except Exception:
-        return ""
+    return best
 
 
-def _get_window_at_point(x: int, y: int, exclude_window_id: int = 0) -> int:
-    """Encontra a janela na posicao especificada.
+def get_process_at_point(x: int, y: int, exclude_window_id: int = 0) -> str:
+    """Retorna o nome do processo da janela em uma coordenada especifica.
 
     Args:
-        x: Coordenada X
-        y: Coordenada Y
-        exclude_window_id: Window ID a excluir
+        x: Coordenada X (pixels)
+        y: Coordenada Y (pixels)
+        exclude_window_id: Window ID a excluir da busca (ex: overlay)
 
     Returns:
-        window_id ou 0 se nao encontrada
+        Nome do app (ex: "Safari") ou string vazia
     """
     try:
-        windows = CGWindowListCopyWindowInfo(
-            kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements,
-            kCGNullWindowID
-        )
+        window = _find_window_at_point(x, y, exclude_window_id)
+        if window is None:
+            return ""
+        return window.get('kCGWindowOwnerName', '')
 
-        if not windows:
-            return 0
+    except Exception:
+        return ""
 
-        windows_sorted = sorted(windows, key=lambda w: w.get('kCGWindowLayer', 0))
 
-        for window in windows_sorted:
-            window_id = window.get('kCGWindowNumber', 0)
-            if window_id == exclude_window_id:
-                continue
+def _bgra_view(data, width: int, height: int, bytes_per_row: int) -> np.ndarray:
+    """Visao (height, width, 4) dos pixels BGRA de um CGImage, sem copia.
 
-            bounds = window.get('kCGWindowBounds', {})
-            wx = int(bounds.get('X', 0))
-            wy = int(bounds.get('Y', 0))
-            ww = int(bounds.get('Width', 0))
-            wh = int(bounds.get('Height', 0))
+    Linhas com padding (bytes_per_row > width * 4) viram uma visao com
+    stride em vez de serem copiadas linha a linha.
+    """
+    img = np.frombuffer(data, dtype=np.uint8)
 
-            if wx <= x < wx + ww and wy <= y < wy + wh:
-                owner = window.get('kCGWindowOwnerName', '')
-                if owner not in ['Window Server', 'Dock', 'SystemUIServer']:
-                    return window_id
+    if bytes_per_row == width * 4:
+        return img.reshape((height, width, 4))
 
-        return 0
+    rows = img[:height * bytes_per_row].reshape((height, bytes_per_row))
+    return rows[:, :width * 4].reshape((height, width, 4))
 
-    except Exception:
-        return 0
+
+def _bgra_to_qpixmap(img: np.ndarray) -> QPixmap:
+    """Converte pixels BGRA (height, width, 4) em QPixmap.
+
+    Em little-endian, Format_ARGB32 ja tem a ordem de bytes BGRA (a mesma
+    usada para a captura do mss), entao nao ha troca de canais por pixel.
+    O QImage apenas aponta para o array (respeitando o stride das linhas);
+    a unica copia e a feita por QPixmap.fromImage, enquanto img esta vivo.
+    """
+    if img.strides[1:] != (4, 1):
+        img = np.ascontiguousarray(img)
+    height, width = img.shape[:2]
+
+    image = QImage(
+        sip.voidptr(img.ctypes.data),
+        width,
+        height,
+        img.strides[0],
+        QImage.Format.Format_ARGB32
+    )
+    return QPixmap.fromImage(image)
 
 
 def _cgimage_to_qpixmap(cg_image) -> QPixmap:
@@ -154,30 +186,10 @@ def _cgimage_to_qpixmap(cg_image) -> QPixmap:
         data_provider = CGImageGetDataProvider(cg_image)
         data = CGDataProviderCopyData(data_provider)
 
-        img = np.frombuffer(data, dtype=np.uint8)
+        img = _bgra_view(data, width, height, bytes_per_row)
 
-        if bytes_per_row == width * 4:
-            img = img.reshape((height, width, 4))
-        else:
-            img_reshaped = np.zeros((height, width, 4), dtype=np.uint8)
-            for row in range(height):
-                start = row * bytes_per_row
-                end = start + width * 4
-                img_reshaped[row] = np.frombuffer(data[start:end], dtype=np.uint8).reshape((width, 4))
-            img = img_reshaped
-
-        # macOS CGImage usa BGRA, converte para RGBA
-        img_rgba = img[:, :, [2, 1, 0, 3]].copy()
-
-        qimage = QImage(
-            img_rgba.data,
-            width,
-            height,
-            width * 4,
-            QImage.Format.Format_RGBA8888
-        ).copy()
-
-        return QPixmap.fromImage(qimage)
+        # macOS CGImage usa BGRA: carregado direto, sem converter para RGBA
+        return _bgra_to_qpixmap(img)
 
     except Exception as e:
         print(f"Erro ao converter CGImage: {e}")
@@ -200,24 +212,15 @@ def capture_window_region_quartz(screen_x: int, screen_y: int, width: int, heigh
         QPixmap da regiao ou None se falhar
     """
     try:
-        # Encontra a janela nessa posicao
-        window_id = _get_window_at_point(screen_x, screen_y)
-        if not window_id:
+        # Encontra a janela nessa posicao; a mesma listagem ja traz os
+        # bounds (em pontos logicos), sem enumerar as janelas de novo
+        window = _find_window_at_point(screen_x, screen_y)
+        if window is None:
             return None
 
-        # Obtem bounds da janela (em pontos logicos)
-        windows = CGWindowListCopyWindowInfo(
-            kCGWindowListOptionOnScreenOnly,
-            kCGNullWindowID
-        )
-
-        window_bounds = None
-        for w in windows:
-            if w.get('kCGWindowNumber', 0) == window_id:
-                window_bounds = w.get('kCGWindowBounds', {})
-                break
-
-        if not window_bounds:
+        window_id = window.get('kCGWindowNumber', 0)
+        window_bounds = window.get('kCGWindowBounds', {})
+        if not window_id or not window_bounds:
             return None
 
         win_left = int(window_bounds.get('X', 0))
@@ -253,16 +256,7 @@ def capture_window_region_quartz(screen_x: int, screen_y: int, width: int, heigh
         data_provider = CGImageGetDataProvider(cg_image)
         data = CGDataProviderCopyData(data_provider)
 
-        img = np.frombuffer(data, dtype=np.uint8)
-
-        if bytes_per_row == img_width * 4:
-            img_array = img.reshape((img_height, img_width, 4))
-        else:
-            img_array = np.zeros((img_height, img_width, 4), dtype=np.uint8)
-            for row in range(img_height):
-                start = row * bytes_per_row
-                end = start + img_width * 4
-                img_array[row] = np.frombuffer(data[start:end], dtype=np.uint8).reshape((img_width, 4))
+        img_array = _bgra_view(data, img_width, img_height, bytes_per_row)
 
         # Calcula regiao relativa a janela (converte pontos logicos para pixels fisicos)
         rel_x = int((screen_x - win_left) * scale_x)
@@ -276,27 +270,21 @@ def capture_window_region_quartz(screen_x: int, screen_y: int, width: int, heigh
         end_x = min(rel_x + region_width, img_width)
         end_y = min(rel_y + region_height, img_height)
 
-        # Extrai a regiao
-        region = img_array[rel_y:end_y, rel_x:end_x].copy()
-
-        # Converte BGRA para RGBA
-        region_rgba = region[:, :, [2, 1, 0, 3]].copy()
-
-        qimage = QImage(
-            region_rgba.data,
-            region_rgba.shape[1],
-            region_rgba.shape[0],
-            region_rgba.shape[1] * 4,
-            QImage.Format.Format_RGBA8888
-        ).copy()
+        # Extrai a regiao (BGRA, carregada direto sem converter para RGBA)
+        region = img_array[rel_y:end_y, rel_x:end_x]
 
-        return QPixmap.fromImage(qimage)
+        return _bgra_to_qpixmap(region)
 
     except Exception as e:
         print(f"Erro ao capturar regiao: {e}")
         return None
 
 
+class _NameSignals(QObject):
+    """Signal para entregar o nome sugerido pelo OCR na thread da GUI."""
+    name_ready = pyqtSignal(str)
+
+
 class SaveCaptureDialog(QDialog):
     """Dialogo para salvar captura."""
 
@@ -342,6 +330,12 @@ class SaveCaptureDialog(QDialog):
     def get_name(self) -> str:
         return self.name_edit.text().strip()
 
+    def suggest_name(self, name: str):
+        """Troca a sugestao, a menos que o usuario ja tenha editado o nome."""
+        if not self.name_edit.isModified():
+            self.name_edit.setText(name)
+            self.name_edit.selectAll()
+
     @staticmethod
     def get_template_name(suggested_name: str, parent=None) -> tuple:
         """Abre dialogo e retorna (nome, ok)."""
@@ -350,26 +344,44 @@ class SaveCaptureDialog(QDialog):
         return dialog.get_name(), result == QDialog.DialogCode.Accepted
 
 
-def extract_text_from_image(pixmap: QPixmap) -> str:
-    """Extrai texto de um QPixmap usando EasyOCR."""
-    try:
-        import numpy as np
-        import io
-        from PIL import Image
+def _qimage_to_array(image: QImage, channels: int) -> np.ndarray:
+    """Visao (height, width, channels) dos pixels de um QImage, sem copia.
+
+    O QImage precisa continuar vivo enquanto a visao for usada.
+    """
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+
+    rows = np.frombuffer(ptr, dtype=np.uint8).reshape((image.height(), image.bytesPerLine()))
+    return rows[:, :image.width() * channels].reshape((image.height(), image.width(), channels))
+
+
+def _ocr_input(pixmap: QPixmap) -> np.ndarray:
+    """Reduz o QPixmap e copia seus pixels RGB para o OCR.
+
+    Deve rodar na thread da GUI (QPixmap nao e thread-safe); o array
+    retornado pode ser usado em qualquer thread.
+    """
+    if max(pixmap.width(), pixmap.height()) > _OCR_MAX_SIDE:
+        pixmap = pixmap.scaled(
+            _OCR_MAX_SIDE, _OCR_MAX_SIDE,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+
+    # Pixels direto do QImage (sem codificar/decodificar PNG)
+    image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGB888)
+    return _qimage_to_array(image, 3).copy()
+
 
+def _read_text(img: np.ndarray) -> str:
+    """Roda o EasyOCR e retorna o texto mais longo com confianca > 0.3."""
+    try:
         reader = _get_ocr_reader()
         if reader is None:
             return ""
 
-        buffer = QBuffer()
-        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
-        pixmap.save(buffer, "PNG")
-        image_bytes = buffer.data().data()
-
-        img = Image.open(io.BytesIO(image_bytes))
-        img_np = np.array(img)
-
-        results = reader.readtext(img_np)
+        results = reader.readtext(img)
         texts = [text for _, text, conf in results if conf > 0.3]
 
         if texts:
@@ -379,20 +391,34 @@ def extract_text_from_image(pixmap: QPixmap) -> str:
         return ""
 
 
+def extract_text_from_image(pixmap: QPixmap) -> str:
+    """Extrai texto de um QPixmap usando EasyOCR."""
+    try:
+        return _read_text(_ocr_input(pixmap))
+    except Exception:
+        return ""
+
+
+# Caracteres removidos ao gerar o nome (ASCII alfanumerico; o texto OCR
+# tambem mantem espacos para separar as palavras)
+_TEXT_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9\s]')
+_PROCESS_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9]')
+
+
 def generate_template_name(text: str, process: str) -> str:
     """Gera nome do template baseado no texto OCR e processo."""
     parts = []
 
     # Texto OCR (sanitizado, max 3 palavras)
     if text:
-        clean_text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+        clean_text = _TEXT_INVALID_CHARS.sub('', text)
         words = clean_text.split()[:3]
         if words:
             parts.append("_".join(words))
 
     # Nome do processo/app
     if process:
-        clean_process = re.sub(r'[^a-zA-Z0-9]', '', process)
+        clean_process = _PROCESS_INVALID_CHARS.sub('', process)
         if clean_process:
             parts.append(clean_process)
 
@@ -423,6 +449,7 @@ class CaptureOverlay(QWidget):
         self._start_pos = None
         self._current_pos = None
         self._selecting = False
+        self._last_selection_rect = QRect()
         self._screenshot = None
         self._active_process = ""
 
@@ -434,6 +461,11 @@ class CaptureOverlay(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, False)
         self.setCursor(Qt.CursorShape.CrossCursor)
 
+        # O OCR so e usado para sugerir o nome ao salvar: carrega enquanto o
+        # usuario seleciona (o lock em _get_ocr_reader faz o save esperar)
+        if fixed_output_path is None and _ocr_reader is None:
+            threading.Thread(target=_get_ocr_reader, daemon=True).start()
+
         self._capture_screen()
 
     def _capture_screen(self):
@@ -460,10 +492,10 @@ class CaptureOverlay(QWidget):
 
     def _try_capture_mss(self) -> bool:
         """Tenta captura usando MSS (multi-monitor via virtual screen)."""
-        try:
-            import mss
-            from PyQt6.QtGui import QImage
+        if mss is None:
+            return False
 
+        try:
             with mss.mss() as sct:
                 # Monitor 0 e o virtual screen (todas as telas combinadas)
                 if len(sct.monitors) < 2:
@@ -476,16 +508,18 @@ class CaptureOverlay(QWidget):
 
                 screenshot = sct.grab(monitor)
 
+                # screenshot.raw ja e BGRA (= ARGB32 em little-endian); .bgra
+                # faria uma copia extra do quadro. QPixmap.fromImage copia os
+                # pixels enquanto screenshot ainda esta vivo
                 img = QImage(
-                    screenshot.bgra,
+                    screenshot.raw,
                     screenshot.width,
                     screenshot.height,
                     screenshot.width * 4,
                     QImage.Format.Format_ARGB32
-                ).copy()
+                )
 
                 self._screenshot = QPixmap.fromImage(img)
-                self._screenshot_original = self._screenshot.copy()
 
                 # MSS captura em pixels fisicos - detecta DPI da tela primaria
                 primary = QGuiApplication.primaryScreen()
@@ -507,8 +541,6 @@ class CaptureOverlay(QWidget):
     def _try_capture_qt_multiscreen(self) -> bool:
         """Tenta captura usando Qt com multiplas telas."""
         try:
-            from PyQt6.QtGui import QImage
-
             screens = QGuiApplication.screens()
             if len(screens) < 2:
                 return False
@@ -530,31 +562,22 @@ class CaptureOverlay(QWidget):
             combined.fill(QColor(0, 0, 0))
 
             painter = QPainter(combined)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
 
             # Captura cada tela e posiciona no pixmap combinado
             for screen in screens:
                 geom = screen.geometry()
                 grab = screen.grabWindow(0)
 
-                # Ajusta para DPI se necessario
-                dpr = screen.devicePixelRatio()
-                if dpr != 1.0:
-                    grab = grab.scaled(
-                        int(grab.width() / dpr),
-                        int(grab.height() / dpr),
-                        Qt.AspectRatioMode.IgnoreAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-
-                # Posicao relativa ao bounding box
-                rel_x = geom.x() - min_x
-                rel_y = geom.y() - min_y
-                painter.drawPixmap(rel_x, rel_y, grab)
+                # Desenha no tamanho logico da tela: o painter ja reduz as
+                # capturas HiDPI ao compor, sem um pixmap escalado intermediario
+                target = QRectF(geom.x() - min_x, geom.y() - min_y, geom.width(), geom.height())
+                source = QRectF(0, 0, grab.width(), grab.height())
+                painter.drawPixmap(target, grab, source)
 
             painter.end()
 
             self._screenshot = combined
-            self._screenshot_original = combined.copy()
             self._scale_x = 1.0
             self._scale_y = 1.0
 
@@ -574,7 +597,6 @@ class CaptureOverlay(QWidget):
 
         geom = screen.geometry()
         self._screenshot = screen.grabWindow(0)
-        self._screenshot_original = self._screenshot.copy()
         self._scale_x = screen.devicePixelRatio()
         self._scale_y = screen.devicePixelRatio()
 
@@ -594,13 +616,20 @@ class CaptureOverlay(QWidget):
         if self._screenshot:
             painter.drawPixmap(0, 0, self._screenshot)
 
-        painter.fillRect(self.rect(), QColor(0, 0, 0, 100))
+        dim = QColor(0, 0, 0, 100)
 
-        if self._start_pos and self._current_pos:
+        if not (self._start_pos and self._current_pos):
+            painter.fillRect(self.rect(), dim)
+        else:
             rect = self._get_selection_rect()
 
-            if self._screenshot:
-                painter.drawPixmap(rect, self._screenshot, rect)
+            # Escurece so as faixas ao redor da selecao: o interior continua
+            # a captura original, sem escurecer e redesenhar por cima
+            full = self.rect()
+            painter.fillRect(QRect(full.left(), full.top(), full.width(), rect.top() - full.top()), dim)
+            painter.fillRect(QRect(full.left(), rect.bottom() + 1, full.width(), full.bottom() - rect.bottom()), dim)
+            painter.fillRect(QRect(full.left(), rect.top(), rect.left() - full.left(), rect.height()), dim)
+            painter.fillRect(QRect(rect.right() + 1, rect.top(), full.right() - rect.right(), rect.height()), dim)
 
             pen = QPen(QColor(0, 162, 232), 2)
             painter.setPen(pen)
@@ -651,6 +680,7 @@ class CaptureOverlay(QWidget):
             self._start_pos = event.pos()
             self._current_pos = event.pos()
             self._selecting = True
+            self._last_selection_rect = QRect()
 
             # Captura processo da janela sob o cursor
             global_pos = self.mapToGlobal(event.pos())
@@ -669,7 +699,13 @@ class CaptureOverlay(QWidget):
     def mouseMoveEvent(self, event):
         if self._selecting:
             self._current_pos = event.pos()
-            self.update()
+
+            # Repinta so a uniao da selecao anterior com a nova (com folga
+            # para a borda e para o rotulo de dimensoes abaixo/a direita)
+            rect = self._get_selection_rect()
+            dirty = self._last_selection_rect.united(rect).adjusted(-4, -4, 100, 30)
+            self._last_selection_rect = rect
+            self.update(dirty)
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self._selecting:
@@ -712,19 +748,24 @@ class CaptureOverlay(QWidget):
         # NOTA: capture_window_region_quartz recebe coordenadas LOGICAS e faz a conversao internamente
         cropped = capture_window_region_quartz(abs_x, abs_y, width, height)
 
-        # Fallback: usa captura do overlay se Quartz falhar
+        # Fallback: recorta da captura do overlay se Quartz falhar
+        # (paintEvent so le self._screenshot, entao ela continua intacta)
         if cropped is None or cropped.isNull():
-            if hasattr(self, '_screenshot_original') and hasattr(self, '_scale_x'):
+            if hasattr(self, '_scale_x'):
                 physical_rect = QRect(
                     int(rect.x() * self._scale_x),
                     int(rect.y() * self._scale_y),
                     int(rect.width() * self._scale_x),
                     int(rect.height() * self._scale_y)
                 )
-                cropped = self._screenshot_original.copy(physical_rect)
+                cropped = self._screenshot.copy(physical_rect)
             else:
                 cropped = self._screenshot.copy(rect)
 
+        # A captura da tela inteira nao e mais usada: libera antes do OCR
+        # e do dialogo de nome (o overlay ja esta oculto)
+        self._screenshot = None
+
         # Centro para deteccao de processo/monitor
         center_x = abs_x + width // 2
         center_y = abs_y + height // 2
@@ -739,16 +780,23 @@ class CaptureOverlay(QWidget):
             self.close()
             return
 
-        # Modo normal: pede nome para salvar
-        suggested_name = "template"
-        try:
-            text = extract_text_from_image(cropped)
-            suggested_name = generate_template_name(text, self._active_process)
-        except Exception:
-            if self._active_process:
-                suggested_name = self._active_process or "template"
+        # Modo normal: pede nome para salvar. O dialogo abre na hora com o
+        # nome do processo; o OCR roda em outra thread e refina a sugestao
+        process = self._active_process
+        dialog = SaveCaptureDialog(generate_template_name("", process))
+        signals = _NameSignals()
+        signals.name_ready.connect(dialog.suggest_name)
+        ocr_input = _ocr_input(cropped)
 
-        name, ok = SaveCaptureDialog.get_template_name(suggested_name)
+        def _suggest():
+            text = _read_text(ocr_input)
+            if text:
+                signals.name_ready.emit(generate_template_name(text, process))
+
+        threading.Thread(target=_suggest, daemon=True).start()
+
+        ok = dialog.exec() == QDialog.DialogCode.Accepted
+        name = dialog.get_name()
 
         if ok and name:
             name = "".join(c for c in name if c.isalnum() or c in "._- ")
@@ -780,15 +828,11 @@ class CaptureOverlay(QWidget):
             screen_x: Coordenada X absoluta da selecao
             screen_y: Coordenada Y absoluta da selecao
         """
-        from PIL import Image
-        from PIL.PngImagePlugin import PngInfo
-
         # Detecta DPI da tela onde a captura foi feita
         capture_dpi = 96
 
         try:
             # Encontra a tela na posicao da selecao
-            from PyQt6.QtCore import QPoint
             screen = QGuiApplication.screenAt(QPoint(screen_x, screen_y))
             if not screen:
                 screen = QGuiApplication.primaryScreen()
@@ -797,20 +841,21 @@ class CaptureOverlay(QWidget):
         except Exception:
             pass
 
-        # Primeiro salva com Qt
-        pixmap.save(str(path), "PNG")
-
-        # Adiciona metadados de DPI
+        # Codifica o PNG uma unica vez, ja com os metadados de DPI, a partir
+        # dos pixels do QImage (sem salvar pelo Qt e reabrir com o PIL)
         try:
-            pil_image = Image.open(str(path))
-            img_copy = pil_image.copy()
-            pil_image.close()
+            if pixmap.hasAlphaChannel():
+                image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
+                pil_image = Image.fromarray(_qimage_to_array(image, 4))
+            else:
+                image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGB888)
+                pil_image = Image.fromarray(_qimage_to_array(image, 3))
 
             metadata = PngInfo()
             metadata.add_text("ImageClicker_DPI", str(capture_dpi))
-            img_copy.save(str(path), "PNG", pnginfo=metadata, dpi=(capture_dpi, capture_dpi))
+            pil_image.save(str(path), "PNG", pnginfo=metadata, dpi=(capture_dpi, capture_dpi))
         except Exception:
-            pass  # Arquivo ja foi salvo pelo Qt
+            pixmap.save(str(path), "PNG")  # Sem metadados, mas a captura nao se perde
 
     def closeEvent(self, event):
         """Limpa recursos ao fechar."""
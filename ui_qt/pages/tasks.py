@@ -315,9 +315,10 @@ class TasksPage(BasePage):
 
     def _refresh_windows(self):
         """Atualiza lista de janelas."""
-        from core import get_windows, get_available_processes
+        from core import get_windows, get_available_processes, invalidate_window_cache
 
         self.window_combo.clear()
+        invalidate_window_cache()
 
         if self.rb_process.isChecked():
             processes = get_available_processes()